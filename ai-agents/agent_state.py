@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Agent State Checkpoints
+Crash-safe warm-start state: a compressed snapshot plus a write-ahead log of deltas
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Dict
+
+from fileutil import atomic_write_bytes
+
+logger = logging.getLogger('StudentAcquisitionAgent.State')
+
+# Snapshot header: magic, format version, sequence number, CRC32 of the compressed body
+SNAPSHOT_HEADER = struct.Struct('<4sBQI')
+SNAPSHOT_MAGIC = b'AGST'
+SNAPSHOT_VERSION = 1
+
+# WAL record header: payload length, CRC32 of the payload, sequence number
+RECORD_HEADER = struct.Struct('<IIQ')
+
+
+def digest(value: Any) -> str:
+    """Stable digest of a JSON-serializable value"""
+    return hashlib.sha1(json.dumps(value, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+class StateStore:
+    """Small key/value state persisted as a snapshot plus a write-ahead log.
+
+    ``save`` appends only the top-level keys that changed since the last
+    save to the WAL, one fsynced record each time. After ``snapshot_every``
+    records the whole state is written to a zlib-compressed snapshot by
+    write-and-rename and the WAL is emptied. ``load`` reads the snapshot
+    and replays newer WAL records, so restoring costs the size of the state
+    plus at most ``snapshot_every`` deltas, however long the agent has run.
+    A torn record at the end of the WAL (a crash mid-append) is dropped.
+    """
+
+    def __init__(self, path: str, snapshot_every: int = 50):
+        self.path = path
+        self.wal_path = path + '.wal'
+        self.snapshot_every = snapshot_every
+        self.state = {}
+        self.sequence = 0
+        self.wal_records = 0
+        self._wal = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict:
+        """Restore the latest state from disk; returns a copy of it"""
+        with self._lock:
+            self.state, self.sequence = self._read_snapshot()
+            self.wal_records = self._replay_wal()
+            return copy.deepcopy(self.state)
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.path):
+            return {}, 0
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        if len(data) < SNAPSHOT_HEADER.size:
+            raise ValueError(f"{self.path} is truncated")
+        magic, version, sequence, crc = SNAPSHOT_HEADER.unpack_from(data)
+        body = data[SNAPSHOT_HEADER.size:]
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(f"{self.path} is not a version {SNAPSHOT_VERSION} state snapshot")
+        if zlib.crc32(body) != crc:
+            raise ValueError(f"{self.path} failed its checksum")
+        return json.loads(zlib.decompress(body)), sequence
+
+    def _replay_wal(self) -> int:
+        if not os.path.exists(self.wal_path):
+            return 0
+        with open(self.wal_path, 'rb') as f:
+            data = f.read()
+
+        offset = replayed = 0
+        while offset + RECORD_HEADER.size <= len(data):
+            length, crc, sequence = RECORD_HEADER.unpack_from(data, offset)
+            payload = data[offset + RECORD_HEADER.size:offset + RECORD_HEADER.size + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                break
+            offset += RECORD_HEADER.size + length
+            # Records already folded into the snapshot are skipped
+            if sequence > self.sequence:
+                self.state.update(json.loads(payload))
+                self.sequence = sequence
+                replayed += 1
+
+        if offset < len(data):
+            logger.warning(f"⚠️ Dropping {len(data) - offset} bytes of torn state log at {self.wal_path}")
+            with open(self.wal_path, 'r+b') as f:
+                f.truncate(offset)
+        return replayed
+
+    def save(self, state: Dict) -> bool:
+        """Log the keys of ``state`` that changed; returns whether anything was written"""
+        # Round-trip through JSON so tuples and lists compare equal to what was stored
+        state = json.loads(_encode(state))
+        with self._lock:
+            delta = {key: value for key, value in state.items() if self.state.get(key) != value}
+            if not delta:
+                return False
+
+            payload = _encode(delta)
+            self.sequence += 1
+            if self._wal is None:
+                os.makedirs(os.path.dirname(self.wal_path) or '.', exist_ok=True)
+                self._wal = open(self.wal_path, 'ab')
+            self._wal.write(RECORD_HEADER.pack(len(payload), zlib.crc32(payload), self.sequence) + payload)
+            self._wal.flush()
+            os.fsync(self._wal.fileno())
+            self.state.update(delta)
+            self.wal_records += 1
+
+            if self.wal_records >= self.snapshot_every:
+                self._snapshot()
+            return True
+
+    def snapshot(self):
+        """Fold the WAL into a fresh snapshot"""
+        with self._lock:
+            self._snapshot()
+
+    def _snapshot(self):
+        body = zlib.compress(_encode(self.state))
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.sequence, zlib.crc32(body))
+        atomic_write_bytes(self.path, header + body)
+        # A crash before this truncate is harmless: replay skips records the snapshot covers
+        if self._wal is not None:
+            self._wal.close()
+        self._wal = open(self.wal_path, 'wb')
+        self.wal_records = 0
+
+    def close(self, compact: bool = True):
+        """Close the WAL, first folding it into the snapshot when ``compact`` is set"""
+        with self._lock:
+            if compact and self.wal_records:
+                self._snapshot()
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
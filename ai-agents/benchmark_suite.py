@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+End-to-End Benchmark Suite
+Times seeded agent simulations and compares them against saved baselines
+"""
+
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from fileutil import atomic_write_json
+from simulation import run_simulation
+
+logger = logging.getLogger('StudentAcquisitionAgent.Bench')
+
+# Scenario name -> simulation arguments
+SCENARIOS = {
+    'default_7d': {'days': 7},
+    'batched_7d': {'days': 7, 'overrides': {'platform_api': {'batch_submit': True}}},
+    'steady_30d': {'days': 30}
+}
+
+# Whether a larger value of each tracked metric is better
+HIGHER_IS_BETTER = {
+    'cycles_per_sec': True,
+    'campaigns_per_sec': True,
+    'peak_memory_mb': False,
+    'time_to_target_hours': False
+}
+
+DEFAULT_BASELINE = 'benchmarks/baseline.json'
+
+AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Import-time changes smaller than this are treated as noise
+IMPORT_NOISE_MS = 5.0
+
+
+def run_scenario(name: str, seed: int = 0, repeat: int = 3) -> Dict:
+    """Run one scenario ``repeat`` times for timing plus once under tracemalloc"""
+    spec = SCENARIOS[name]
+    runs = [run_simulation(spec['days'], seed, spec.get('overrides')) for _ in range(repeat)]
+    best = max(runs, key=lambda run: run['cycles_per_sec'])
+
+    # Separate run: tracemalloc slows allocation-heavy code too much to time alongside it
+    tracemalloc.start()
+    try:
+        run_simulation(spec['days'], seed, spec.get('overrides'))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'cycles_per_sec': best['cycles_per_sec'],
+        'campaigns_per_sec': best['campaigns_per_sec'],
+        'peak_memory_mb': peak / (1024 * 1024),
+        'time_to_target_hours': best['time_to_target_hours'],
+        'wall_seconds': best['wall_seconds'],
+        'cycles': best['cycles'],
+        'campaigns_submitted': best['campaigns_submitted'],
+        'students': best['students'],
+        'spend': round(best['spend'], 2)
+    }
+
+
+def measure_import(modules: Sequence[str], repeat: int = 5) -> float:
+    """Best-of-``repeat`` milliseconds to import ``modules`` in a fresh interpreter"""
+    code = (f"import importlib, sys, time; sys.path.insert(0, {AGENT_DIR!r}); "
+            f"started = time.perf_counter(); "
+            f"[importlib.import_module(name) for name in {list(modules)!r}]; "
+            f"print((time.perf_counter() - started) * 1000)")
+    timings = []
+    # An empty working directory, so no local state or config is picked up
+    with tempfile.TemporaryDirectory(prefix='agent-import-') as cwd:
+        for _ in range(repeat):
+            completed = subprocess.run([sys.executable, '-c', code], cwd=cwd, check=True,
+                                       stdout=subprocess.PIPE, universal_newlines=True)
+            timings.append(float(completed.stdout))
+    return min(timings)
+
+
+def measure_command_imports(repeat: int = 5) -> Dict[str, float]:
+    """Import cost of the CLI itself and of each of its subcommands, in milliseconds"""
+    from main import COMMAND_MODULES
+
+    costs = {'cli': measure_import(['main'], repeat)}
+    for command, modules in COMMAND_MODULES.items():
+        costs[command] = measure_import(['main', *modules], repeat)
+    return costs
+
+
+def run_benchmarks(scenarios: Optional[List[str]] = None, seed: int = 0, repeat: int = 3,
+                   import_repeat: int = 5) -> Dict:
+    """Run the named scenarios (all by default) and return results with run metadata"""
+    results = {}
+    for name in scenarios or list(SCENARIOS):
+        logger.info(f"⏱️ Running scenario {name}")
+        results[name] = run_scenario(name, seed, repeat)
+    return {
+        'created': datetime.now().isoformat(),
+        'seed': seed,
+        'python': sys.version.split()[0],
+        'machine': platform.platform(),
+        'scenarios': results,
+        'imports': measure_command_imports(import_repeat) if import_repeat > 0 else {}
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float = 0.15) -> List[str]:
+    """Return a description of every metric that regressed by more than ``tolerance``.
+
+    Seeded runs must also reproduce the baseline's students and spend; a
+    mismatch means agent behaviour changed, so the numbers are not
+    comparable until a new baseline is saved.
+    """
+    problems = []
+    if results.get('seed') != baseline.get('seed'):
+        return [f"seed {results.get('seed')} differs from baseline seed {baseline.get('seed')}"]
+
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            continue
+        if (current['students'], current['spend']) != (previous['students'], previous['spend']):
+            problems.append(f"{name}: simulated outcome changed "
+                            f"({previous['students']} -> {current['students']} students)")
+        for metric, higher_is_better in HIGHER_IS_BETTER.items():
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change < -tolerance) if higher_is_better else (change > tolerance):
+                problems.append(f"{name}: {metric} {old:.4g} -> {new:.4g} ({change:+.1%})")
+
+    for command, new in results.get('imports', {}).items():
+        old = baseline.get('imports', {}).get(command)
+        if old and new - old > max(IMPORT_NOISE_MS, old * tolerance):
+            problems.append(f"import {command}: {old:.1f} ms -> {new:.1f} ms")
+    return problems
+
+
+def load_baseline(path: str = DEFAULT_BASELINE) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict, path: str = DEFAULT_BASELINE):
+    atomic_write_json(path, results)
+    logger.info(f"💾 Saved benchmark baseline to {path}")
+
+
+def format_results(results: Dict) -> str:
+    lines = [f"{'scenario':<12} {'cycles/s':>10} {'campaigns/s':>12} {'peak MB':>9} {'target h':>9}"]
+    for name, result in results['scenarios'].items():
+        target = result['time_to_target_hours']
+        lines.append(f"{name:<12} {result['cycles_per_sec']:>10.1f} {result['campaigns_per_sec']:>12.0f} "
+                     f"{result['peak_memory_mb']:>9.1f} {'-' if target is None else f'{target:.1f}':>9}")
+    if results.get('imports'):
+        lines.append('')
+        lines.append(f"{'command':<12} {'import ms':>10}")
+        for command, cost in results['imports'].items():
+            lines.append(f"{command:<12} {cost:>10.1f}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark seeded agent simulations")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--import-repeat', type=int, default=5,
+                        help="Fresh interpreters per command import measurement (0 skips it)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scenario, args.seed, args.repeat, args.import_repeat)
+    print(format_results(results))
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    problems = compare(results, baseline, args.tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Campaign Budget Allocation
+Online Thompson-sampling allocator over platform x strategy arms
+"""
+
+import logging
+import random
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('StudentAcquisitionAgent.Budget')
+
+Arm = Tuple[str, str]
+
+# Static budget weights used before any results were tracked
+PLATFORM_MULTIPLIERS = {
+    'facebook': 1.2,
+    'instagram': 1.1,
+    'tiktok': 0.9,
+    'google_ads': 1.3
+}
+
+STRATEGY_MULTIPLIERS = {
+    'free_trial_offer': 1.5,
+    'discount_campaign': 1.2,
+    'webinar_signup': 0.8,
+    'content_marketing': 0.7,
+    'influencer_partnerships': 2.0
+}
+
+
+def static_weight(arm: Arm) -> float:
+    platform, strategy = arm
+    return PLATFORM_MULTIPLIERS.get(platform, 1.0) * STRATEGY_MULTIPLIERS.get(strategy, 1.0)
+
+
+MEAN_STATIC_WEIGHT = (
+    sum(PLATFORM_MULTIPLIERS.values()) / len(PLATFORM_MULTIPLIERS)
+    * sum(STRATEGY_MULTIPLIERS.values()) / len(STRATEGY_MULTIPLIERS)
+)
+
+
+class StaticAllocator:
+    """Split the budget by the fixed platform and strategy multipliers"""
+
+    adaptive = False
+
+    def allocate(self, arms: Sequence[Arm], budget: float) -> Dict[Arm, float]:
+        weights = {arm: static_weight(arm) for arm in arms}
+        total = sum(weights.values()) or 1.0
+        return {arm: budget * weight / total for arm, weight in weights.items()}
+
+    def update(self, arm: Arm, conversions: float, cost: float):
+        pass
+
+
+class ThompsonAllocator:
+    """Thompson sampling over conversions per rand for each arm.
+
+    Each arm's conversion rate per rand has a Gamma posterior (conjugate to
+    Poisson conversions for a given spend). A decision draws one rate per
+    arm and splits the budget: ``explore_share`` evenly across arms, the rest
+    in proportion to ``rate ** greed``. Both steps are O(arms).
+
+    The prior mean is ``prior_rate`` scaled by the static multipliers, worth
+    ``prior_spend`` rand of evidence, so early decisions look like the old
+    static split and real results take over quickly.
+    """
+
+    adaptive = True
+
+    def __init__(self, prior_rate: float = 0.005, prior_spend: float = 2000.0,
+                 explore_share: float = 0.2, greed: float = 2.0,
+                 rng: Optional[random.Random] = None):
+        self.prior_rate = prior_rate
+        self.prior_spend = prior_spend
+        self.explore_share = explore_share
+        self.greed = greed
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+        # arm -> [observed conversions, observed spend]
+        self._evidence = {}
+
+    @classmethod
+    def from_config(cls, config: Dict, rng: Optional[random.Random] = None) -> 'ThompsonAllocator':
+        """Build an allocator from the ``budget_allocator`` config section"""
+        return cls(
+            prior_rate=config.get('prior_conversions_per_rand', 0.005),
+            prior_spend=config.get('prior_spend', 2000.0),
+            explore_share=config.get('explore_share', 0.2),
+            greed=config.get('greed', 2.0),
+            rng=rng
+        )
+
+    def _posterior(self, arm: Arm) -> Tuple[float, float]:
+        conversions, spend = self._evidence.get(arm, (0.0, 0.0))
+        prior_mean = self.prior_rate * static_weight(arm) / MEAN_STATIC_WEIGHT
+        shape = prior_mean * self.prior_spend + conversions
+        rate = self.prior_spend + spend
+        return shape, rate
+
+    def allocate(self, arms: Sequence[Arm], budget: float) -> Dict[Arm, float]:
+        """Split ``budget`` across ``arms`` from one posterior draw per arm"""
+        if not arms:
+            return {}
+        with self._lock:
+            samples = {}
+            for arm in arms:
+                shape, rate = self._posterior(arm)
+                samples[arm] = self.rng.gammavariate(shape, 1.0 / rate) ** self.greed
+
+        total = sum(samples.values())
+        floor = budget * self.explore_share / len(arms)
+        exploit = budget - floor * len(arms)
+        return {
+            arm: floor + (exploit * sample / total if total else exploit / len(arms))
+            for arm, sample in samples.items()
+        }
+
+    def update(self, arm: Arm, conversions: float, cost: float):
+        """Record an observed campaign outcome for an arm"""
+        with self._lock:
+            evidence = self._evidence.setdefault(arm, [0.0, 0.0])
+            evidence[0] += conversions
+            evidence[1] += cost
+
+
+def build_allocator(config: Dict, rng: Optional[random.Random] = None):
+    """Return the allocator named by ``config['policy']`` (``thompson`` or ``static``)"""
+    if config.get('policy', 'thompson') == 'static':
+        return StaticAllocator()
+    return ThompsonAllocator.from_config(config, rng)
+
+
+def replay_simulation(history: Dict[Arm, List[Tuple[float, float]]], allocator,
+                      budget: float, target: int = 2000, max_cycles: int = 1000,
+                      seed: int = 0) -> Dict:
+    """Replay logged results under an allocation policy until ``target`` students.
+
+    ``history`` maps each arm to logged ``(conversions, cost)`` results. Each
+    cycle the policy splits ``budget``; every arm's outcome is drawn by
+    resampling one of its logged results, scaling its conversions per rand
+    to the allocated spend and adding Poisson noise.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    arms = [arm for arm, results in history.items() if results]
+    rates = {
+        arm: np.array([conversions / cost if cost else 0.0 for conversions, cost in history[arm]])
+        for arm in arms
+    }
+
+    students = 0
+    spend = 0.0
+    for cycle in range(1, max_cycles + 1):
+        for arm, allocated in allocator.allocate(arms, budget).items():
+            rate = rates[arm][rng.integers(len(rates[arm]))]
+            conversions = int(rng.poisson(rate * allocated))
+            allocator.update(arm, conversions, allocated)
+            students += conversions
+            spend += allocated
+        if students >= target:
+            return {'reached': True, 'cycles': cycle, 'spend': spend, 'students': students}
+    return {'reached': False, 'cycles': max_cycles, 'spend': spend, 'students': students}
+
+
+def compare_policies(history: Dict[Arm, List[Tuple[float, float]]], budget: float,
+                     target: int = 2000, runs: int = 20) -> Dict[str, Dict]:
+    """Average cycles and spend to reach ``target`` for static vs Thompson allocation"""
+    summary = {}
+    for name, factory in (
+        ('static', lambda seed: StaticAllocator()),
+        ('thompson', lambda seed: ThompsonAllocator(rng=random.Random(seed))),
+    ):
+        outcomes = [
+            replay_simulation(history, factory(seed), budget, target, seed=seed)
+            for seed in range(runs)
+        ]
+        summary[name] = {
+            'reached': sum(outcome['reached'] for outcome in outcomes) / runs,
+            'mean_cycles': sum(outcome['cycles'] for outcome in outcomes) / runs,
+            'mean_spend': sum(outcome['spend'] for outcome in outcomes) / runs
+        }
+    return summary
+
+
+def load_history(store_path: str = 'data/campaign_results') -> Dict[Arm, List[Tuple[float, float]]]:
+    """Read logged (conversions, cost) results per arm from the results store"""
+    from campaign_store import CampaignResultStore
+
+    store = CampaignResultStore(store_path, read_only=True)
+    platforms = store.categories('platform')
+    strategies = store.categories('strategy')
+    history = {}
+    for chunk in store.scan(['platform', 'strategy', 'conversions', 'cost']):
+        for platform, strategy, conversions, cost in zip(
+                chunk['platform'].tolist(), chunk['strategy'].tolist(),
+                chunk['conversions'].tolist(), chunk['cost'].tolist()):
+            history.setdefault((platforms[platform], strategies[strategy]), []).append((conversions, cost))
+    return history
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay logged campaign results under each budget policy")
+    parser.add_argument('--store', default='data/campaign_results')
+    parser.add_argument('--budget', type=float, default=5000)
+    parser.add_argument('--target', type=int, default=2000)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    history = load_history(args.store)
+    if not history:
+        parser.exit(1, f"No campaign results found in {args.store}\n")
+    for policy, result in compare_policies(history, args.budget, args.target, args.runs).items():
+        print(f"{policy:>9}: reached {result['reached']:.0%} of runs, "
+              f"{result['mean_cycles']:.1f} cycles, R{result['mean_spend']:,.0f} spent")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Campaign Dispatch Engine
+Fans out blocking campaign calls concurrently with per-platform limits
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger('StudentAcquisitionAgent.Dispatch')
+
+
+class CallToken:
+    """Settles a race between a dispatched call and its deadline.
+
+    The call claims the token with ``start`` right before it sends anything
+    to a platform; the dispatcher ``cancel``s it when the deadline passes.
+    Whichever comes first wins, so a call either never sends (cancelled) or
+    is known to be in flight and records its own late response.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        """Claim the call for sending; False once it has been cancelled"""
+        with self._lock:
+            if self.cancelled:
+                return False
+            self.started = True
+            return True
+
+    def cancel(self) -> bool:
+        """Cancel the call; False if it already started sending"""
+        with self._lock:
+            if self.started:
+                return False
+            self.cancelled = True
+            return True
+
+
+class CampaignDispatcher:
+    """Run campaign calls concurrently and gather their outcomes in order.
+
+    Each call is a callable tagged with its platform and given a
+    ``CallToken``. Calls run on a bounded thread pool, at most
+    ``per_platform_concurrency`` at a time per platform, and each one is
+    given ``call_timeout`` seconds once it starts. At the deadline the
+    token is cancelled and the outcome reported as timed out. A call that
+    had not started sending stops there; one already in flight is marked
+    ``pending`` and keeps running, and is then the only place its result
+    is recorded.
+
+    ``max_workers=0`` runs the calls inline, one after another and without
+    timeouts, which keeps seeded simulations reproducible.
+    """
+
+    def __init__(self, max_workers: int = 16, per_platform_concurrency: int = 4,
+                 call_timeout: float = 10.0,
+                 platform_concurrency: Optional[Dict[str, int]] = None):
+        self.max_workers = max_workers
+        self.per_platform_concurrency = per_platform_concurrency
+        self.call_timeout = call_timeout
+        self.platform_concurrency = dict(platform_concurrency or {})
+        self.in_flight = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='campaign-dispatch'
+        ) if max_workers > 0 else None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'CampaignDispatcher':
+        """Build a dispatcher from the ``dispatch`` section of the agent config"""
+        return cls(
+            max_workers=config.get('max_workers', 16),
+            per_platform_concurrency=config.get('per_platform_concurrency', 4),
+            call_timeout=config.get('call_timeout_seconds', 10.0),
+            platform_concurrency=config.get('platform_concurrency')
+        )
+
+    def concurrency_for(self, platform: str) -> int:
+        """Return the concurrency limit for a platform"""
+        return max(1, self.platform_concurrency.get(platform, self.per_platform_concurrency))
+
+    def dispatch(self, calls: List[Tuple[str, Callable[[CallToken], Any]]]) -> List[Dict]:
+        """Run ``(platform, fn)`` calls concurrently, each as ``fn(token)``.
+
+        Returns one outcome dict per call, in the same order as ``calls``,
+        with keys ``value``, ``error``, ``timed_out``, ``pending`` and
+        ``elapsed``.
+        """
+        if not calls:
+            return []
+        if self._executor is None:
+            return [self._run_inline(fn) for _, fn in calls]
+        return asyncio.run(self._gather(calls))
+
+    def _run_inline(self, fn: Callable[[CallToken], Any]) -> Dict:
+        started = time.monotonic()
+        outcome = {'value': None, 'error': None, 'timed_out': False, 'pending': False, 'elapsed': 0.0}
+        try:
+            outcome['value'] = fn(CallToken())
+        except Exception as e:
+            outcome['error'] = str(e)
+        outcome['elapsed'] = time.monotonic() - started
+        return outcome
+
+    async def _gather(self, calls: List[Tuple[str, Callable[[CallToken], Any]]]) -> List[Dict]:
+        loop = asyncio.get_running_loop()
+        semaphores = {}
+        for platform, _ in calls:
+            if platform not in semaphores:
+                semaphores[platform] = asyncio.Semaphore(self.concurrency_for(platform))
+
+        return await asyncio.gather(*[
+            self._run_one(loop, semaphores[platform], fn)
+            for platform, fn in calls
+        ])
+
+    async def _run_one(self, loop: asyncio.AbstractEventLoop,
+                       semaphore: asyncio.Semaphore, fn: Callable[[CallToken], Any]) -> Dict:
+        async with semaphore:
+            started = time.monotonic()
+            outcome = {'value': None, 'error': None, 'timed_out': False, 'pending': False, 'elapsed': 0.0}
+            token = CallToken()
+            self.in_flight += 1
+            try:
+                outcome['value'] = await asyncio.wait_for(
+                    loop.run_in_executor(self._executor, fn, token),
+                    timeout=self.call_timeout
+                )
+            except asyncio.TimeoutError:
+                outcome['timed_out'] = True
+                outcome['pending'] = not token.cancel()
+                outcome['error'] = f"timed out after {self.call_timeout}s"
+            except Exception as e:
+                outcome['error'] = str(e)
+            finally:
+                self.in_flight -= 1
+            outcome['elapsed'] = time.monotonic() - started
+            return outcome
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting calls and release the worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
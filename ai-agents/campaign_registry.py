@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Campaign Registry
+Live campaigns with indexes for threshold-driven monitoring
+"""
+
+import bisect
+import collections
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional
+
+from fileutil import atomic_write_json
+
+logger = logging.getLogger('StudentAcquisitionAgent.Registry')
+
+STATUSES = ('active', 'scaled', 'paused')
+
+# Sorts after any campaign key, so bisecting (threshold, _LAST) skips ties
+_LAST = '\uffff'
+
+
+class CampaignRecord:
+    """One submitted campaign; slotted to keep thousands of them cheap"""
+
+    __slots__ = ('tracking_id', 'campaign_id', 'platform', 'strategy', 'location', 'status',
+                 'budget', 'impressions', 'clicks', 'conversions', 'cost', 'cpa', 'created_at')
+
+    FIELDS = __slots__
+
+    def __init__(self, tracking_id: str, campaign_id: str, platform: str, strategy: str,
+                 location: Optional[str], status: str, budget: float, impressions: int,
+                 clicks: int, conversions: int, cost: float, cpa: float, created_at: float):
+        self.tracking_id = tracking_id
+        self.campaign_id = campaign_id
+        self.platform = platform
+        self.strategy = strategy
+        self.location = location
+        self.status = status
+        self.budget = budget
+        self.impressions = impressions
+        self.clicks = clicks
+        self.conversions = conversions
+        self.cost = cost
+        self.cpa = cpa
+        self.created_at = created_at
+
+    @property
+    def key(self) -> str:
+        """The platform's campaign id, or our tracking id when the platform returned none"""
+        return self.campaign_id or self.tracking_id
+
+    @property
+    def conversion_rate(self) -> float:
+        return self.conversions / self.clicks if self.clicks else 0.0
+
+    def as_dict(self) -> Dict:
+        return dict({field: getattr(self, field) for field in self.FIELDS},
+                    conversion_rate=self.conversion_rate)
+
+
+class CampaignRegistry:
+    """Campaigns that are still running, indexed for monitoring.
+
+    Records are keyed by the platform's ``campaign_id`` (the ``tracking_id``
+    when a platform returns none), indexed by platform, strategy and
+    status, and held in two sorted indexes: CPA for campaigns that can
+    still be paused, and conversion rate for campaigns that can still be
+    scaled. Monitoring
+    bisects those indexes, so each pass only visits campaigns past a
+    threshold. Campaigns are retired ``ttl`` seconds after launch, oldest
+    first, without scanning the rest.
+    """
+
+    def __init__(self, ttl: float = 24 * 3600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._records = {}
+        self._by_platform = collections.defaultdict(set)
+        self._by_strategy = collections.defaultdict(set)
+        self._by_status = collections.defaultdict(set)
+        # Sorted (value, key) pairs
+        self._cpa_index = []
+        self._rate_index = []
+        # (created_at, key) in launch order
+        self._launches = collections.deque()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, campaign_id: str) -> Optional[CampaignRecord]:
+        return self._records.get(campaign_id)
+
+    def add(self, campaign_data: Dict, response: Dict, timestamp: float) -> CampaignRecord:
+        """Register an accepted campaign from its payload and platform response"""
+        record = CampaignRecord(
+            tracking_id=campaign_data['tracking_id'],
+            campaign_id=response.get('campaign_id', ''),
+            platform=campaign_data['platform'],
+            strategy=campaign_data['strategy'],
+            location=campaign_data.get('location'),
+            status='active',
+            budget=campaign_data['budget'],
+            impressions=response.get('impressions', 0),
+            clicks=response.get('clicks', 0),
+            conversions=response.get('conversions', 0),
+            cost=response.get('cost', 0.0),
+            cpa=response.get('cpa', 0.0),
+            created_at=timestamp
+        )
+        with self._lock:
+            # The platform reported an update to a campaign it already returned
+            if record.key in self._records:
+                self._remove(self._records[record.key])
+            self._insert(record)
+            self._launches.append((record.created_at, record.key))
+        return record
+
+    def counts(self, by: str = 'status') -> Dict[str, int]:
+        index = {'platform': self._by_platform, 'strategy': self._by_strategy, 'status': self._by_status}[by]
+        with self._lock:
+            return {value: len(ids) for value, ids in index.items() if ids}
+
+    def above_cpa(self, threshold: float) -> List[CampaignRecord]:
+        """Unpaused campaigns whose CPA exceeds ``threshold``, worst first"""
+        with self._lock:
+            start = bisect.bisect_right(self._cpa_index, (threshold, _LAST))
+            return [self._records[key] for _, key in reversed(self._cpa_index[start:])]
+
+    def above_conversion_rate(self, threshold: float) -> List[CampaignRecord]:
+        """Active, not yet scaled campaigns converting above ``threshold``, best first"""
+        with self._lock:
+            start = bisect.bisect_right(self._rate_index, (threshold, _LAST))
+            return [self._records[key] for _, key in reversed(self._rate_index[start:])]
+
+    def set_status(self, campaign_id: str, status: str):
+        if status not in STATUSES:
+            raise ValueError(f"Unknown campaign status '{status}'")
+        with self._lock:
+            record = self._records[campaign_id]
+            self._remove(record)
+            record.status = status
+            self._insert(record)
+
+    def scale_budget(self, campaign_id: str, multiplier: float) -> float:
+        """Multiply a campaign's budget and mark it scaled; returns the new budget"""
+        with self._lock:
+            record = self._records[campaign_id]
+            self._remove(record)
+            record.budget *= multiplier
+            record.status = 'scaled'
+            self._insert(record)
+            return record.budget
+
+    def expire(self, now: float) -> int:
+        """Retire campaigns launched more than ``ttl`` seconds before ``now``"""
+        retired = 0
+        with self._lock:
+            while self._launches and self._launches[0][0] <= now - self.ttl:
+                created_at, key = self._launches.popleft()
+                record = self._records.get(key)
+                # Skip launches superseded by a re-registered campaign
+                if record is not None and record.created_at == created_at:
+                    self._remove(record)
+                    retired += 1
+        return retired
+
+    def _insert(self, record: CampaignRecord):
+        key = record.key
+        self._records[key] = record
+        self._by_platform[record.platform].add(key)
+        self._by_strategy[record.strategy].add(key)
+        self._by_status[record.status].add(key)
+        if record.status != 'paused':
+            bisect.insort(self._cpa_index, (record.cpa, key))
+        if record.status == 'active':
+            bisect.insort(self._rate_index, (record.conversion_rate, key))
+
+    def _remove(self, record: CampaignRecord):
+        key = record.key
+        del self._records[key]
+        self._by_platform[record.platform].discard(key)
+        self._by_strategy[record.strategy].discard(key)
+        self._by_status[record.status].discard(key)
+        if record.status != 'paused':
+            self._discard(self._cpa_index, (record.cpa, key))
+        if record.status == 'active':
+            self._discard(self._rate_index, (record.conversion_rate, key))
+
+    @staticmethod
+    def _discard(index: List, entry):
+        position = bisect.bisect_left(index, entry)
+        if position < len(index) and index[position] == entry:
+            del index[position]
+
+    def save(self, path: str):
+        """Snapshot the registry to ``path`` atomically"""
+        with self._lock:
+            rows = [[getattr(record, field) for field in CampaignRecord.FIELDS]
+                    for record in self._records.values()]
+        atomic_write_json(path, {'fields': list(CampaignRecord.FIELDS), 'campaigns': rows})
+
+    @classmethod
+    def load(cls, path: str, ttl: float = 24 * 3600) -> 'CampaignRegistry':
+        """Restore a registry from a snapshot, or start empty if there is none"""
+        registry = cls(ttl)
+        if not os.path.exists(path):
+            return registry
+
+        with open(path) as f:
+            snapshot = json.load(f)
+        fields = snapshot['fields']
+        records = [CampaignRecord(**dict(zip(fields, row))) for row in snapshot['campaigns']]
+        for record in sorted(records, key=lambda record: record.created_at):
+            registry._insert(record)
+            registry._launches.append((record.created_at, record.key))
+        return registry
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Campaign Results Store
+Append-only columnar storage for campaign results, backed by .npy segments
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, the single writer is trusted
+    fcntl = None
+
+from fileutil import atomic_write_json
+
+logger = logging.getLogger('StudentAcquisitionAgent.Store')
+
+# Column name -> fixed dtype (array typecode, also understood by NumPy)
+COLUMNS = (
+    ('timestamp', 'd'),
+    ('platform', 'H'),
+    ('strategy', 'H'),
+    ('location', 'H'),
+    ('impressions', 'q'),
+    ('clicks', 'q'),
+    ('conversions', 'q'),
+    ('cost', 'd'),
+    ('cpa', 'd'),
+)
+COLUMN_TYPES = dict(COLUMNS)
+
+# Columns stored as small integer codes into a per-store label list
+CATEGORICAL = ('platform', 'strategy', 'location')
+
+# Location label for campaigns that target every configured location.
+# It is always code 0, which is also what segments written before the
+# location column existed read back as.
+ALL_LOCATIONS = 'all'
+DEFAULT_LABELS = {'location': [ALL_LOCATIONS]}
+
+# Columns added after the first release. Segments written earlier have no
+# file for them and read back as code/value 0; any other missing column
+# file means the segment is damaged.
+ADDED_COLUMNS = ('location',)
+
+MANIFEST = 'manifest.json'
+WRITER_LOCK = 'writer.lock'
+
+# Times a reader re-reads the manifest when the writer replaced the tail under it
+READ_RETRIES = 3
+
+
+class CampaignResultStore:
+    """Append-only columnar store of campaign results.
+
+    Rows are buffered in typed arrays and written as one ``.npy`` file per
+    column. A segment is sealed once it holds ``segment_rows`` rows; until
+    then ``flush`` rewrites it as the tail segment. ``manifest.json`` is the
+    commit point, so a crash mid-flush leaves the previous state readable.
+    Sealed segments are memory-mapped when scanned.
+
+    Only one process may open a store for writing; it holds ``writer.lock``
+    while open and is the only one that deletes segments. Reports and other
+    tools open it with ``read_only=True``, which sees the last committed
+    manifest, never cleans up and never flushes.
+    """
+
+    def __init__(self, root: str = 'data/campaign_results', segment_rows: int = 65536,
+                 read_only: bool = False):
+        self.root = root
+        self.segment_rows = segment_rows
+        self.read_only = read_only
+        self._lock = threading.Lock()
+        self._writer_lock = None
+        self._segment_cache = {}
+
+        if read_only:
+            for attempt in range(READ_RETRIES):
+                try:
+                    self._load()
+                    break
+                except FileNotFoundError:
+                    # The writer flushed a new tail and deleted the one we were reading
+                    if attempt == READ_RETRIES - 1:
+                        raise
+        else:
+            os.makedirs(root, exist_ok=True)
+            self._acquire_writer_lock()
+            self._load()
+            self._collect_garbage()
+
+    def _reset(self):
+        self._sealed = []
+        self._tail = None
+        self._generation = 0
+        self._labels = {name: list(DEFAULT_LABELS.get(name, [])) for name in CATEGORICAL}
+        self._codes = {name: {label: code for code, label in enumerate(self._labels[name])}
+                       for name in CATEGORICAL}
+        self._buffer = self._empty_buffer()
+
+    def _acquire_writer_lock(self):
+        self._writer_lock = open(os.path.join(self.root, WRITER_LOCK), 'a')
+        if fcntl is None:
+            return
+        try:
+            fcntl.flock(self._writer_lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._writer_lock.close()
+            self._writer_lock = None
+            raise RuntimeError(f"{self.root} is already open for writing by another process; "
+                               f"open it with read_only=True to read it")
+
+    @staticmethod
+    def _empty_buffer() -> Dict[str, array]:
+        return {name: array(typecode) for name, typecode in COLUMNS}
+
+    def _load(self):
+        self._reset()
+        manifest_path = os.path.join(self.root, MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            self._sealed = manifest['sealed']
+            self._tail = manifest['tail']
+            self._generation = manifest['generation']
+            for name in CATEGORICAL:
+                self._labels[name] = manifest['categories'].get(name, list(DEFAULT_LABELS.get(name, [])))
+                self._codes[name] = {label: code for code, label in enumerate(self._labels[name])}
+
+            if self._tail:
+                # Reopen the unsealed tail segment for appending
+                for name, column in self._load_segment(self._tail['name'], self._tail['rows']).items():
+                    self._buffer[name].frombytes(np.ascontiguousarray(column).tobytes())
+                self._segment_cache.pop(self._tail['name'], None)
+
+    def _collect_garbage(self):
+        # Drop segments left behind by an interrupted flush. Safe only while
+        # holding the writer lock: nobody else can be mid-flush.
+        live = {segment['name'] for segment in self._sealed}
+        if self._tail:
+            live.add(self._tail['name'])
+        for entry in os.listdir(self.root):
+            if entry.startswith('seg_') and entry not in live:
+                shutil.rmtree(os.path.join(self.root, entry), ignore_errors=True)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(segment['rows'] for segment in self._sealed) + len(self._buffer['timestamp'])
+
+    def categories(self, name: str) -> List[str]:
+        """Return the labels of a categorical column, indexed by code"""
+        with self._lock:
+            return list(self._labels[name])
+
+    def _check_writable(self):
+        if self.read_only:
+            raise RuntimeError(f"{self.root} was opened read-only")
+
+    def append(self, timestamp: float, platform: str, strategy: str, impressions: int,
+               clicks: int, conversions: int, cost: float, cpa: float,
+               location: str = ALL_LOCATIONS):
+        """Append one campaign result"""
+        self._check_writable()
+        with self._lock:
+            row = {
+                'timestamp': timestamp,
+                'platform': self._encode('platform', platform),
+                'strategy': self._encode('strategy', strategy),
+                'location': self._encode('location', location),
+                'impressions': impressions,
+                'clicks': clicks,
+                'conversions': conversions,
+                'cost': cost,
+                'cpa': cpa
+            }
+            for name, value in row.items():
+                self._buffer[name].append(value)
+
+            if len(self._buffer['timestamp']) >= self.segment_rows:
+                self._flush_locked()
+
+    def append_result(self, campaign_data: Dict, response: Dict, timestamp: Optional[float] = None):
+        """Append the result of an accepted campaign submission"""
+        self.append(
+            time.time() if timestamp is None else timestamp,
+            campaign_data['platform'],
+            campaign_data['strategy'],
+            response.get('impressions', 0),
+            response.get('clicks', 0),
+            response.get('conversions', 0),
+            response.get('cost', 0.0),
+            response.get('cpa', 0.0),
+            campaign_data.get('location') or ALL_LOCATIONS
+        )
+
+    def append_columns(self, columns: Dict[str, np.ndarray]):
+        """Bulk-append rows given as one array per column.
+
+        Categorical columns are given as arrays of labels; ``location`` may
+        be omitted for campaigns that target every location.
+        """
+        self._check_writable()
+        with self._lock:
+            encoded = {}
+            rows = len(columns['timestamp'])
+            for name, typecode in COLUMNS:
+                if name == 'location' and name not in columns:
+                    encoded[name] = np.zeros(rows, dtype=typecode)
+                    continue
+                values = np.asarray(columns[name])
+                if name in CATEGORICAL:
+                    labels, inverse = np.unique(values, return_inverse=True)
+                    codes = np.array([self._encode(name, str(label)) for label in labels])
+                    values = codes[inverse]
+                encoded[name] = np.ascontiguousarray(values, dtype=typecode)
+
+            total = len(encoded['timestamp'])
+            start = 0
+            while start < total:
+                room = self.segment_rows - len(self._buffer['timestamp'])
+                stop = min(total, start + room)
+                for name, values in encoded.items():
+                    self._buffer[name].frombytes(values[start:stop].tobytes())
+                if len(self._buffer['timestamp']) >= self.segment_rows:
+                    self._flush_locked()
+                start = stop
+
+    def _encode(self, name: str, label: str) -> int:
+        code = self._codes[name].get(label)
+        if code is None:
+            code = self._codes[name][label] = len(self._labels[name])
+            self._labels[name].append(label)
+        return code
+
+    def flush(self):
+        """Persist buffered rows"""
+        self._check_writable()
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        rows = len(self._buffer['timestamp'])
+        if rows == (self._tail['rows'] if self._tail else 0):
+            return
+
+        self._generation += 1
+        name = f"seg_{len(self._sealed):06d}_{self._generation}"
+        directory = os.path.join(self.root, name)
+        os.makedirs(directory)
+        for column, values in self._buffer.items():
+            with open(os.path.join(directory, column + '.npy'), 'wb') as f:
+                np.save(f, np.frombuffer(values, dtype=COLUMN_TYPES[column]))
+                f.flush()
+                os.fsync(f.fileno())
+
+        previous_tail = self._tail
+        segment = {'name': name, 'rows': rows}
+        if rows >= self.segment_rows:
+            self._sealed.append(segment)
+            self._tail = None
+            self._buffer = self._empty_buffer()
+        else:
+            self._tail = segment
+
+        atomic_write_json(os.path.join(self.root, MANIFEST), {
+            'sealed': self._sealed,
+            'tail': self._tail,
+            'generation': self._generation,
+            'categories': self._labels
+        })
+        if previous_tail:
+            shutil.rmtree(os.path.join(self.root, previous_tail['name']), ignore_errors=True)
+
+    def close(self):
+        """Flush (writers only), release cached memory maps and the writer lock"""
+        if not self.read_only:
+            self.flush()
+        self._segment_cache.clear()
+        if self._writer_lock is not None:
+            self._writer_lock.close()
+            self._writer_lock = None
+
+    def _load_segment(self, name: str, rows: int) -> Dict[str, np.ndarray]:
+        segment = self._segment_cache.get(name)
+        if segment is None:
+            segment = {}
+            for column, typecode in COLUMNS:
+                path = os.path.join(self.root, name, column + '.npy')
+                if column in ADDED_COLUMNS and not os.path.exists(path):
+                    # Column added after this segment was written
+                    segment[column] = np.zeros(rows, dtype=typecode)
+                else:
+                    segment[column] = np.load(path, mmap_mode='r')
+            self._segment_cache[name] = segment
+        return segment
+
+    def scan(self, columns: Optional[List[str]] = None, start: int = 0,
+             stop: Optional[int] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Yield ``{column: ndarray}`` chunks covering rows ``start:stop``"""
+        columns = columns or [name for name, _ in COLUMNS]
+        with self._lock:
+            sealed = [(segment['name'], segment['rows']) for segment in self._sealed]
+            buffered = {
+                name: np.frombuffer(self._buffer[name], dtype=COLUMN_TYPES[name]).copy()
+                for name in columns
+            }
+        sources = sealed + [(None, len(buffered[columns[0]]))]
+
+        offset = 0
+        for name, rows in sources:
+            lower = max(start - offset, 0)
+            upper = rows if stop is None else min(stop - offset, rows)
+            offset += rows
+            if lower >= upper:
+                continue
+            chunk = buffered if name is None else self._load_segment(name, rows)
+            if lower == 0 and upper == rows:
+                yield {column: chunk[column] for column in columns}
+            else:
+                yield {column: chunk[column][lower:upper] for column in columns}
+
+    def read(self, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """Return every stored row as one array per column"""
+        columns = columns or [name for name, _ in COLUMNS]
+        chunks = list(self.scan(columns))
+        if not chunks:
+            return {name: np.empty(0, dtype=COLUMN_TYPES[name]) for name in columns}
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in columns}
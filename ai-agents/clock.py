@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Agent Clocks
+Wall-clock time for live runs and a virtual clock for simulations
+"""
+
+import threading
+import time
+from datetime import datetime
+
+
+class SystemClock:
+    """Real time; the default for a live agent"""
+
+    virtual = False
+
+    def time(self) -> float:
+        return time.time()
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """Simulated time that only moves when slept on or advanced.
+
+    ``sleep`` returns immediately and moves the clock forward, so simulated
+    API latency costs no real time. Latency is charged serially, as if calls
+    ran one after another.
+    """
+
+    virtual = True
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._lock = threading.Lock()
+        self.slept = 0.0
+
+    def time(self) -> float:
+        return self._now
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self._now)
+
+    def sleep(self, seconds: float):
+        with self._lock:
+            self._now += max(0.0, seconds)
+            self.slept += max(0.0, seconds)
+
+    def advance_to(self, timestamp: float):
+        """Move the clock forward to ``timestamp``; never moves it back"""
+        with self._lock:
+            self._now = max(self._now, timestamp)
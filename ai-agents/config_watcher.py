@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Configuration Watcher
+Cheap change detection and validation for the agent's JSON config
+"""
+
+import json
+import logging
+import os
+from numbers import Number
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger('StudentAcquisitionAgent.Config')
+
+# Sections that are optional but must be objects when present
+SECTION_KEYS = ('dispatch', 'platform_api', 'log_writer', 'results_store', 'budget_allocator',
+                'scheduler', 'sharding', 'campaign_registry', 'reports', 'progress', 'metrics',
+                'rate_limits', 'config_reload', 'state')
+
+# Sections read only at startup; edits to them are reported but need a restart
+RESTART_SECTIONS = frozenset(('log_writer', 'results_store', 'scheduler', 'progress', 'metrics',
+                              'config_reload', 'state'))
+
+
+class ConfigError(ValueError):
+    """Raised when a config file cannot be parsed or fails validation"""
+
+
+def _is_string_list(value) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(item, str) for item in value)
+
+
+def validate_config(config: Dict) -> List[str]:
+    """Return a list of problems with ``config``; empty when it is valid"""
+    if not isinstance(config, dict):
+        return ["config must be a JSON object"]
+
+    problems = []
+    if not _is_string_list(config.get('platforms')):
+        problems.append("platforms must be a non-empty list of platform names")
+    if not _is_string_list(config.get('campaign_strategies')):
+        problems.append("campaign_strategies must be a non-empty list of strategy names")
+
+    budget = config.get('daily_budget')
+    if isinstance(budget, bool) or not isinstance(budget, Number) or budget <= 0:
+        problems.append("daily_budget must be a positive number")
+
+    targeting = config.get('targeting')
+    if not isinstance(targeting, dict):
+        problems.append("targeting must be an object")
+    else:
+        age_range = targeting.get('age_range')
+        if (not isinstance(age_range, list) or len(age_range) != 2
+                or not all(isinstance(age, int) and not isinstance(age, bool) for age in age_range)
+                or not 13 <= age_range[0] <= age_range[1] <= 100):
+            problems.append("targeting.age_range must be [min, max] ages between 13 and 100")
+        if not _is_string_list(targeting.get('locations')):
+            problems.append("targeting.locations must be a non-empty list")
+        if 'interests' in targeting and not isinstance(targeting['interests'], list):
+            problems.append("targeting.interests must be a list")
+
+    for section in SECTION_KEYS:
+        if section in config and not isinstance(config[section], dict):
+            problems.append(f"{section} must be an object")
+    return problems
+
+
+def load_config_file(path: str) -> Dict:
+    """Read and validate a config file, raising ``ConfigError`` on any problem"""
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    except ValueError as e:
+        raise ConfigError(f"{path} is not valid JSON: {str(e)}")
+    problems = validate_config(config)
+    if problems:
+        raise ConfigError(f"{path} is invalid: " + '; '.join(problems))
+    return config
+
+
+def changed_sections(old: Dict, new: Dict) -> Set[str]:
+    """Top-level keys whose values differ between two configs"""
+    return {key for key in set(old) | set(new) if old.get(key) != new.get(key)}
+
+
+class ConfigWatcher:
+    """Detect edits to a config file by polling its mtime and size.
+
+    ``poll`` costs one ``stat`` when nothing changed. A changed file is
+    parsed and validated; an invalid edit is logged once and ignored until
+    the file changes again, so the running config is never replaced by a
+    broken one.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._signature = self._stat()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> Optional[Dict]:
+        """Return the new config if the file changed and is valid, else None"""
+        signature = self._stat()
+        if signature == self._signature:
+            return None
+        self._signature = signature
+        if signature is None:
+            logger.warning(f"⚠️ Config file {self.path} disappeared; keeping the current config")
+            return None
+
+        try:
+            return load_config_file(self.path)
+        except (ConfigError, OSError) as e:
+            logger.error(f"❌ Ignoring config change: {str(e)}")
+            return None
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+File Utilities
+Crash-safe helpers shared by the agent's on-disk state
+"""
+
+import json
+import os
+import tempfile
+from typing import Any
+
+
+def atomic_write_bytes(path: str, data: bytes):
+    """Write ``data`` to ``path`` so readers see either the old or the new file"""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(path: str, data: Any):
+    """Atomically replace ``path`` with ``data`` encoded as JSON"""
+    atomic_write_bytes(path, json.dumps(data).encode('utf-8'))
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Agent Instrumentation
+Counters, gauges and latency histograms with a Prometheus-style endpoint
+"""
+
+import json
+import logging
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('StudentAcquisitionAgent.Metrics')
+
+# Latency buckets in seconds, from a fast in-process call up to a slow API round trip
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = '') -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[Tuple[str, float]]:
+        with self._lock:
+            return [(self.name + _format_labels(self.labels, key), value)
+                    for key, value in sorted(self._values.items())]
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {'|'.join(key) or 'total': value for key, value in self._values.items()}
+
+
+class Gauge:
+    """Point-in-time value, either set directly or read from a callback"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str, callback: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.help = help_text
+        self.callback = callback
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def read(self) -> float:
+        if self.callback is None:
+            return self.value
+        try:
+            return float(self.callback())
+        except Exception:
+            return float('nan')
+
+    def samples(self) -> List[Tuple[str, float]]:
+        return [(self.name, self.read())]
+
+    def snapshot(self) -> Optional[float]:
+        # A failed callback reads as NaN, which JSON cannot carry
+        value = self.read()
+        return None if math.isnan(value) else value
+
+
+class Histogram:
+    """Fixed-bucket histogram with bucket-interpolated percentiles"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labels)
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def percentile(self, series: List[float], q: float) -> float:
+        counts = series[:-1]
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        for position, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[position - 1] if position else 0.0
+                upper = self.buckets[position] if position < len(self.buckets) else lower
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def samples(self) -> List[Tuple[str, float]]:
+        lines = []
+        with self._lock:
+            series_items = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in series_items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append((self.name + '_bucket' + _format_labels(self.labels, key, f'le="{le}"'), cumulative))
+            lines.append((self.name + '_sum' + _format_labels(self.labels, key), series[-1]))
+            lines.append((self.name + '_count' + _format_labels(self.labels, key), cumulative))
+        return lines
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            series_items = [(key, list(series)) for key, series in self._series.items()]
+        summary = {}
+        for key, series in series_items:
+            count = sum(series[:-1])
+            summary['|'.join(key) or 'total'] = {
+                'count': count,
+                'mean': series[-1] / count if count else 0.0,
+                'p50': self.percentile(series, 0.50),
+                'p90': self.percentile(series, 0.90),
+                'p99': self.percentile(series, 0.99)
+            }
+        return summary
+
+
+class MetricsRegistry:
+    """Named metrics for the agent plus timing helpers.
+
+    ``mode`` is ``full`` (time every call), ``sampled`` (time a
+    ``sample_rate`` fraction of calls; counters still see every call) or
+    ``off``. Sampling keeps the overhead negligible enough to leave on in
+    production.
+    """
+
+    def __init__(self, mode: str = 'sampled', sample_rate: float = 0.1):
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self._sampler = random.Random()
+        self._metrics = {}
+        self._server = None
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'MetricsRegistry':
+        """Build a registry from the ``metrics`` section of the agent config"""
+        return cls(mode=config.get('mode', 'sampled'), sample_rate=config.get('sample_rate', 0.1))
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    def _register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, callback: Optional[Callable[[], float]] = None) -> Gauge:
+        return self._register(Gauge(name, help_text, callback))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def should_time(self, sample: bool = True) -> bool:
+        if self.mode == 'full' or (self.mode == 'sampled' and not sample):
+            return True
+        return self.mode == 'sampled' and self._sampler.random() < self.sample_rate
+
+    @contextmanager
+    def timer(self, histogram: Histogram, sample: bool = True, **labels) -> Iterator[None]:
+        """Observe the duration of the ``with`` block, subject to the sampling mode.
+
+        Pass ``sample=False`` for infrequent operations that should always be
+        timed unless instrumentation is off.
+        """
+        if not self.should_time(sample):
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.observe(time.perf_counter() - started, **labels)
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample, value in metric.samples():
+                lines.append(f"{sample} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict:
+        """Return metrics as plain data, with latency percentiles per histogram"""
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def serve(self, host: str = '127.0.0.1', port: int = 9108) -> Tuple[str, int]:
+        """Expose ``/metrics`` (Prometheus text) and ``/metrics.json`` over HTTP"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body = registry.render_prometheus().encode()
+                    content_type = 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body = json.dumps(registry.snapshot()).encode()
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='metrics-endpoint', daemon=True).start()
+        address = self._server.server_address[:2]
+        logger.info(f"📡 Metrics endpoint on http://{address[0]}:{address[1]}/metrics")
+        return address
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class AgentMetrics(MetricsRegistry):
+    """The student acquisition agent's standard metric set"""
+
+    def __init__(self, mode: str = 'sampled', sample_rate: float = 0.1):
+        super().__init__(mode, sample_rate)
+        self.cycle_seconds = self.histogram(
+            'acquisition_cycle_seconds', 'Duration of run_acquisition_cycle')
+        self.cycles_total = self.counter(
+            'acquisition_cycles_total', 'Acquisition cycles by outcome', ['status'])
+        self.campaign_seconds = self.histogram(
+            'campaign_execute_seconds', 'Duration of execute_campaign including the platform call', ['platform'])
+        self.platform_call_seconds = self.histogram(
+            'platform_call_seconds', 'Latency of platform API submissions', ['platform', 'kind'])
+        self.campaigns_total = self.counter(
+            'campaigns_total', 'Campaign submissions by result', ['platform', 'result'])
+        self.rejections_total = self.counter(
+            'campaign_rejections_total', 'Rejected campaigns by platform error code', ['platform', 'error_code'])
+        self.progress_seconds = self.histogram(
+            'progress_update_seconds', 'Duration of progress delivery attempts')
+        self.progress_total = self.counter(
+            'progress_updates_total', 'Progress updates by outcome', ['status'])
+        self.log_enqueue_seconds = self.histogram(
+            'jsonl_enqueue_seconds', 'Time to hand a record to the JSONL writer', ['stream'])
+        self.log_flush_seconds = self.histogram(
+            'jsonl_flush_seconds', 'Time the JSONL writer thread spends writing one batch to a file', ['stream'])
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Local HTTP Servers
+In-process stand-ins for remote endpoints, used by simulations and benchmarks
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Type
+
+
+class LocalRequestHandler(BaseHTTPRequestHandler):
+    """Keep-alive JSON handler; subclasses implement ``do_POST``"""
+
+    protocol_version = 'HTTP/1.1'
+    # Send headers and body in one segment so keep-alive clients don't hit delayed ACKs
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def read_json(self) -> Dict:
+        return json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+
+    def send_json(self, status: int, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer:
+    """Threaded HTTP server on a background thread, usable as a context manager.
+
+    Keyword ``settings`` become attributes of the underlying server, where
+    the handler reads them as ``self.server.<name>``.
+    """
+
+    def __init__(self, handler: Type[LocalRequestHandler], host: str = '127.0.0.1', port: int = 0,
+                 **settings):
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        for name, value in settings.items():
+            setattr(self.httpd, name, value)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
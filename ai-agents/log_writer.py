@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Background JSONL Log Writer
+Moves log serialization and file I/O off the campaign dispatch path
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger('StudentAcquisitionAgent.LogWriter')
+
+_STOP = object()
+
+
+class _Stream:
+    """An open JSONL file plus the bookkeeping needed to rotate it"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.handle = open(path, 'a', encoding='utf-8')
+        self.size = self.handle.tell()
+        self.day = datetime.now().strftime('%Y%m%d')
+
+
+class JsonlLogWriter:
+    """Queue records for one or more JSONL files and write them in batches.
+
+    ``write`` only enqueues the record; a single background thread encodes
+    queued records and appends them once ``flush_records`` are pending or
+    ``flush_interval`` seconds have passed. Files are rotated when they
+    exceed ``max_bytes`` or when the day changes, and rotated files can be
+    gzipped. Pending records are flushed on ``close`` and at interpreter
+    exit.
+
+    When the queue is full, records are dropped and counted in
+    ``records_dropped`` so a slow disk never stalls the caller;
+    ``block_when_full`` makes ``write`` wait instead. ``on_flush`` is called
+    on the writer thread with each file's path and the seconds its batch
+    took to write.
+    """
+
+    def __init__(self, max_queue: int = 10000, flush_records: int = 500,
+                 flush_interval: float = 1.0, max_bytes: int = 50 * 1024 * 1024,
+                 rotate_daily: bool = True, compress: bool = False,
+                 block_when_full: bool = False,
+                 on_flush: Optional[Callable[[str, float], None]] = None):
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress = compress
+        self.block_when_full = block_when_full
+        self.on_flush = on_flush
+        self.records_written = 0
+        self.records_dropped = 0
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._streams = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='jsonl-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, config: Dict,
+                    on_flush: Optional[Callable[[str, float], None]] = None) -> 'JsonlLogWriter':
+        """Build a writer from the ``log_writer`` section of the agent config"""
+        return cls(
+            max_queue=config.get('max_queue', 10000),
+            flush_records=config.get('flush_records', 500),
+            flush_interval=config.get('flush_interval_seconds', 1.0),
+            max_bytes=config.get('max_bytes', 50 * 1024 * 1024),
+            rotate_daily=config.get('rotate_daily', True),
+            compress=config.get('compress', False),
+            block_when_full=config.get('block_when_full', False),
+            on_flush=on_flush
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def write(self, path: str, record: Dict) -> bool:
+        """Queue a record for ``path``; returns False if it was dropped.
+
+        The record is encoded later on the writer thread, so callers must
+        not mutate it after handing it over.
+        """
+        if self._closed:
+            return False
+        try:
+            self._queue.put((path, record), block=self.block_when_full)
+            return True
+        except queue.Full:
+            self.records_dropped += 1
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is on disk"""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Flush pending records, stop the writer thread and close files"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        pending = {}
+        pending_count = 0
+        deadline = time.monotonic() + self.flush_interval
+
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is not None and item is not _STOP and not isinstance(item, threading.Event):
+                path, record = item
+                try:
+                    pending.setdefault(path, []).append(json.dumps(record) + '\n')
+                    pending_count += 1
+                except (TypeError, ValueError) as e:
+                    logger.error(f"❌ Unserializable log record for {path}: {str(e)}")
+                if pending_count < self.flush_records and time.monotonic() < deadline:
+                    continue
+
+            self._flush_pending(pending)
+            pending = {}
+            pending_count = 0
+            deadline = time.monotonic() + self.flush_interval
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                for stream in self._streams.values():
+                    stream.handle.close()
+                self._streams.clear()
+                return
+
+    def _flush_pending(self, pending: Dict):
+        for path, lines in pending.items():
+            started = time.perf_counter()
+            try:
+                stream = self._stream_for(path)
+                data = ''.join(lines)
+                stream.handle.write(data)
+                stream.handle.flush()
+                stream.size += len(data.encode('utf-8'))
+                self.records_written += len(lines)
+            except Exception as e:
+                logger.error(f"❌ Log write failed for {path}: {str(e)}")
+            if self.on_flush is not None:
+                self.on_flush(path, time.perf_counter() - started)
+
+    def _stream_for(self, path: str) -> _Stream:
+        stream = self._streams.get(path)
+        if stream is None:
+            stream = self._streams[path] = _Stream(path)
+
+        day_changed = self.rotate_daily and stream.day != datetime.now().strftime('%Y%m%d')
+        if stream.size > 0 and (stream.size >= self.max_bytes or day_changed):
+            self._rotate(stream)
+            stream = self._streams[path] = _Stream(path)
+        return stream
+
+    def _rotate(self, stream: _Stream):
+        stream.handle.close()
+        # Named after the day the records were written, not the day they were rotated
+        rotated = base = f"{stream.path}.{stream.day}"
+        suffix = 1
+        while os.path.exists(rotated) or os.path.exists(rotated + '.gz'):
+            rotated = f"{base}-{suffix}"
+            suffix += 1
+        os.replace(stream.path, rotated)
+
+        if self.compress:
+            with open(rotated, 'rb') as src, gzip.open(rotated + '.gz', 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotated)
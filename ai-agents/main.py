@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+AI Agents Command Line
+Runs the student acquisition agent and its one-off tools
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import List, Optional
+
+from config_watcher import ConfigError
+
+# Heavy modules are imported inside each command, so a command only pays for what it uses
+COMMAND_MODULES = {
+    'run': ('student_acquisition',),
+    'once': ('student_acquisition',),
+    'report': ('reports',),
+    'simulate': ('simulation', 'student_acquisition'),
+    'bench': ('benchmark_suite', 'student_acquisition')
+}
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def run(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='main.py run', description="Run the agent's scheduled jobs until stopped")
+    parser.add_argument('--log-level', default='INFO')
+    args = parser.parse_args(argv)
+
+    import student_acquisition
+    student_acquisition.main(args.log_level)
+    return 0
+
+
+def once(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='main.py once', description="Run one acquisition cycle and exit")
+    parser.add_argument('--log-level', default='INFO')
+    parser.add_argument('--daily-report', action='store_true', help="Also write the daily report")
+    args = parser.parse_args(argv)
+
+    from student_acquisition import StudentAcquisitionAgent, configure_logging
+    config = StudentAcquisitionAgent.load_config()
+    configure_logging(config.get('log_writer', {}).get('log_dir', 'logs'), args.log_level)
+
+    agent = StudentAcquisitionAgent(config=config)
+    try:
+        agent.run_acquisition_cycle()
+        if args.daily_report:
+            agent.generate_daily_report()
+    finally:
+        agent.close()
+    print(json.dumps(agent.performance_metrics, indent=2))
+    return 1 if agent.metrics.cycles_total.snapshot().get('error') else 0
+
+
+def report(argv: List[str]) -> int:
+    logging.basicConfig(level=logging.WARNING, format=LOG_FORMAT)
+    import reports
+    return reports.main(argv)
+
+
+def simulate(argv: List[str]) -> int:
+    logging.basicConfig(level=logging.WARNING, format=LOG_FORMAT)
+    import simulation
+    return simulation.main(argv)
+
+
+def bench(argv: List[str]) -> int:
+    logging.basicConfig(level=logging.WARNING, format=LOG_FORMAT)
+    import benchmark_suite
+    return benchmark_suite.main(argv)
+
+
+COMMANDS = {
+    'run': run,
+    'once': once,
+    'report': report,
+    'simulate': simulate,
+    'bench': bench
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description="IntelliCourse AI agents",
+        epilog="Run 'main.py <command> -h' for a command's options."
+    )
+    parser.add_argument('command', nargs='?', default='run', choices=list(COMMANDS),
+                        help="run (default): run the agent; once: a single cycle; report: stream a history report; "
+                             "simulate: seeded virtual-time run; bench: benchmark suite")
+    parser.add_argument('args', nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    try:
+        return COMMANDS[args.command](args.args)
+    except ConfigError as e:
+        print(f"Invalid configuration: {str(e)}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Campaign Metrics Engine
+Vectorized aggregation of stored campaign results
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from campaign_store import CampaignResultStore
+
+logger = logging.getLogger('StudentAcquisitionAgent.Metrics')
+
+COURSE_PRICE = 500  # Average course price
+
+# Additive measures summed per group
+SUM_COLUMNS = ('impressions', 'clicks', 'conversions', 'cost')
+
+
+def derive_metrics(sums: Dict, course_price: float = COURSE_PRICE) -> Dict:
+    """Add rate metrics to a dict of summed measures"""
+    impressions = sums['impressions']
+    clicks = sums['clicks']
+    conversions = sums['conversions']
+    cost = sums['cost']
+    sums['revenue'] = conversions * course_price
+    sums['ctr'] = clicks / impressions if impressions else 0.0
+    sums['conversion_rate'] = conversions / clicks if clicks else 0.0
+    sums['cpa'] = cost / conversions if conversions else 0.0
+    return sums
+
+
+class MetricsEngine:
+    """Compute campaign KPIs over a ``CampaignResultStore`` with NumPy.
+
+    Rows are reduced chunk by chunk with ``np.bincount`` over combined
+    group codes, so memory stays flat however much history is stored.
+    """
+
+    def __init__(self, store: CampaignResultStore, course_price: float = COURSE_PRICE):
+        self.store = store
+        self.course_price = course_price
+
+    def totals(self, since: Optional[float] = None, until: Optional[float] = None) -> Dict:
+        """Return summed measures and rates over all results in a time range"""
+        groups = self.group_by((), since=since, until=until)
+        if groups:
+            return groups[0]
+        return derive_metrics({'campaigns': 0, 'impressions': 0, 'clicks': 0,
+                               'conversions': 0, 'cost': 0.0}, self.course_price)
+
+    def group_by(self, keys: Sequence[str] = ('platform', 'strategy'),
+                 window: Optional[float] = None, since: Optional[float] = None,
+                 until: Optional[float] = None, start_row: int = 0,
+                 stop_row: Optional[int] = None) -> List[Dict]:
+        """Aggregate results by categorical ``keys`` and optional time ``window``.
+
+        ``window`` is a bucket width in seconds; each group then carries a
+        ``window_start`` timestamp. ``start_row``/``stop_row`` restrict the
+        scan to a range of stored rows. Returns one metrics dict per
+        non-empty group, in key order.
+        """
+        labels = {key: self.store.categories(key) for key in keys}
+        sizes = [max(1, len(labels[key])) for key in keys]
+        group_count = int(np.prod(sizes)) if keys else 1
+
+        columns = list(keys) + list(SUM_COLUMNS)
+        if window or since is not None or until is not None:
+            columns.append('timestamp')
+
+        # (group code, window bucket) -> [campaigns, impressions, clicks, conversions, cost]
+        accumulated = {}
+        for chunk in self.store.scan(columns, start=start_row, stop=stop_row):
+            mask = None
+            if since is not None:
+                mask = chunk['timestamp'] >= since
+            if until is not None:
+                upper = chunk['timestamp'] < until
+                mask = upper if mask is None else mask & upper
+            if mask is not None:
+                if not mask.any():
+                    continue
+                chunk = {name: values[mask] for name, values in chunk.items()}
+
+            # Skip rows whose labels were added after ``labels`` was read
+            for key, size in zip(keys, sizes):
+                if len(chunk[key]) and chunk[key].max() >= size:
+                    known = chunk[key] < size
+                    chunk = {name: values[known] for name, values in chunk.items()}
+
+            rows = len(chunk['conversions'])
+            if rows == 0:
+                continue
+
+            group = np.zeros(rows, dtype=np.int64)
+            for key, size in zip(keys, sizes):
+                group = group * size + chunk[key]
+
+            bucket_offset = 0
+            bucket_count = 1
+            if window:
+                buckets = (chunk['timestamp'] // window).astype(np.int64)
+                bucket_offset = int(buckets.min())
+                bucket_count = int(buckets.max()) - bucket_offset + 1
+                group = group * bucket_count + (buckets - bucket_offset)
+
+            length = group_count * bucket_count
+            if length == 1:
+                counts = np.array([rows])
+                sums = [np.array([chunk[name].sum()]) for name in SUM_COLUMNS]
+            else:
+                counts = np.bincount(group, minlength=length)
+                sums = [np.bincount(group, weights=chunk[name], minlength=length) for name in SUM_COLUMNS]
+
+            for index in np.flatnonzero(counts):
+                code, bucket = divmod(int(index), bucket_count)
+                entry = accumulated.setdefault((code, bucket + bucket_offset), [0, 0, 0, 0, 0.0])
+                entry[0] += int(counts[index])
+                for position, values in enumerate(sums, start=1):
+                    entry[position] += values[index]
+
+        results = []
+        for (code, bucket), entry in sorted(accumulated.items()):
+            row = {}
+            for key, size in reversed(list(zip(keys, sizes))):
+                code, label_code = divmod(code, size)
+                row[key] = labels[key][label_code]
+            row = {key: row[key] for key in keys}
+            if window:
+                row['window_start'] = bucket * window
+            row['campaigns'] = entry[0]
+            row['impressions'] = int(entry[1])
+            row['clicks'] = int(entry[2])
+            row['conversions'] = int(entry[3])
+            row['cost'] = float(entry[4])
+            results.append(derive_metrics(row, self.course_price))
+        return results
+
+
+def benchmark(rows: int = 10_000_000) -> Dict[str, float]:
+    """Time totals and grouped queries over ``rows`` synthetic results"""
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    platforms = np.array(['facebook', 'instagram', 'tiktok', 'google_ads'])
+    strategies = np.array(['free_trial_offer', 'discount_campaign', 'webinar_signup',
+                           'content_marketing', 'influencer_partnerships'])
+    now = time.time()
+    timings = {}
+
+    with tempfile.TemporaryDirectory(prefix='campaign_results_') as root:
+        store = CampaignResultStore(root)
+        store.append_columns({
+            'timestamp': np.sort(rng.uniform(now - 30 * 86400, now, rows)),
+            'platform': platforms[rng.integers(0, len(platforms), rows)],
+            'strategy': strategies[rng.integers(0, len(strategies), rows)],
+            'impressions': rng.integers(5000, 50000, rows),
+            'clicks': rng.integers(50, 500, rows),
+            'conversions': rng.integers(1, 20, rows),
+            'cost': rng.uniform(500, 2500, rows),
+            'cpa': rng.uniform(50, 500, rows),
+        })
+        store.close()
+
+        engine = MetricsEngine(CampaignResultStore(root, read_only=True))
+        for name, query in (
+            ('totals', lambda: engine.totals()),
+            ('by_platform_strategy', lambda: engine.group_by(('platform', 'strategy'))),
+            ('by_strategy_daily', lambda: engine.group_by(('strategy',), window=86400)),
+            ('last_7_days', lambda: engine.totals(since=now - 7 * 86400)),
+        ):
+            query()  # warm the page cache
+            started = time.perf_counter()
+            query()
+            timings[name] = time.perf_counter() - started
+        engine.store.close()
+
+    return timings
+
+
+if __name__ == "__main__":
+    for query, seconds in benchmark().items():
+        print(f"{query:>22}: {seconds * 1000:,.1f} ms")
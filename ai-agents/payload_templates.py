@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Campaign Payload Templates
+Precompiled creatives and payload skeletons reused across campaigns
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import random
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger('StudentAcquisitionAgent.Templates')
+
+# Creative per platform; a tuple of headlines gives variants picked per campaign
+CREATIVE_APPROACHES = {
+    'facebook': {
+        'ad_type': 'carousel',
+        'headline': tuple(f"Master AI Skills - {offer} Offer" for offer in ('Limited', 'Special', 'Exclusive')),
+        'description': "Join thousands learning cutting-edge AI technologies. Transform your career today!",
+        'cta': 'LEARN_MORE'
+    },
+    'instagram': {
+        'ad_type': 'story',
+        'headline': 'AI Course That Actually Works!',
+        'description': 'See real results in weeks, not years. 👇',
+        'cta': 'SWIPE_UP'
+    },
+    'tiktok': {
+        'ad_type': 'in_feed',
+        'headline': 'This AI skill changed everything!',
+        'description': 'Find out why professionals are switching to AI careers',
+        'cta': 'LEARN_MORE'
+    },
+    'google_ads': {
+        'ad_type': 'search',
+        'headline': 'AI Courses - Expert-Led Training',
+        'description': 'Learn from industry experts. Get certified. Advance your career.',
+        'cta': 'ENROLL_NOW'
+    }
+}
+
+
+def targeting_hash(targeting: Dict) -> str:
+    """Stable digest of a targeting section"""
+    return hashlib.sha1(json.dumps(targeting, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def compile_creatives(platform: str) -> Tuple[Dict, ...]:
+    """Expand a platform's creative into one ready-made dict per headline variant"""
+    creative = CREATIVE_APPROACHES.get(platform, CREATIVE_APPROACHES['facebook'])
+    headlines = creative['headline']
+    if isinstance(headlines, str):
+        headlines = (headlines,)
+    return tuple(dict(creative, headline=headline) for headline in headlines)
+
+
+class PayloadTemplate:
+    """Everything about a campaign payload that does not change between cycles"""
+
+    __slots__ = ('base', 'creatives', 'tracking_prefix', 'budget_share')
+
+    def __init__(self, base: Dict, creatives: Tuple[Dict, ...], tracking_prefix: str, budget_share: float):
+        self.base = base
+        self.creatives = creatives
+        self.tracking_prefix = tracking_prefix
+        self.budget_share = budget_share
+
+
+class PayloadTemplateCache:
+    """Compiled payload templates keyed by (platform, strategy, location, targeting hash).
+
+    A template holds a private snapshot of the targeting, the compiled
+    creatives and the tracking-id prefix, so building a payload only fills
+    in the budget, tracking id and creative variant. Payloads share the
+    template's targeting and creative dicts; callers must treat them as
+    read-only. ``invalidate`` drops every template after the config
+    changes; the targeting digest is recomputed once per config version.
+    """
+
+    def __init__(self, config: Dict, rng: Optional[random.Random] = None):
+        self.config = config
+        self.rng = rng or random.Random()
+        self.hits = 0
+        self.misses = 0
+        self._templates = {}
+        self._targeting_hash = None
+        self._stamp = (None, '')
+        # Creatives do not depend on the config, so they survive invalidation
+        self._creatives = {}
+
+    def invalidate(self, config: Optional[Dict] = None):
+        """Drop compiled templates, optionally switching to a new config"""
+        if config is not None:
+            self.config = config
+        self._templates = {}
+        self._targeting_hash = None
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def tracking_stamp(self, now: datetime) -> str:
+        """Tracking-id timestamp, formatted once per second"""
+        second = int(now.timestamp())
+        cached_second, stamp = self._stamp
+        if cached_second != second:
+            stamp = now.strftime('%Y%m%d_%H%M%S')
+            self._stamp = (second, stamp)
+        return stamp
+
+    def template(self, platform: str, strategy: str, location: Optional[str] = None) -> PayloadTemplate:
+        digest = self._targeting_hash
+        if digest is None:
+            digest = self._targeting_hash = targeting_hash(self.config['targeting'])
+        key = (platform, strategy, location, digest)
+
+        template = self._templates.get(key)
+        if template is not None:
+            self.hits += 1
+            return template
+
+        self.misses += 1
+        template = self._compile(platform, strategy, location)
+        self._templates[key] = template
+        return template
+
+    def _compile(self, platform: str, strategy: str, location: Optional[str]) -> PayloadTemplate:
+        targeting = copy.deepcopy(self.config['targeting'])
+        tracking_prefix = f"{platform}_{strategy}_"
+        budget_share = 1.0
+        if location is not None:
+            budget_share = 1.0 / max(1, len(targeting['locations']))
+            targeting['locations'] = [location]
+            tracking_prefix += f"{location.lower().replace(' ', '_')}_"
+
+        base = {
+            'platform': platform,
+            'strategy': strategy,
+            'location': location,
+            'targeting': targeting
+        }
+        return PayloadTemplate(base, self.creatives(platform), tracking_prefix, budget_share)
+
+    def creatives(self, platform: str) -> Tuple[Dict, ...]:
+        creatives = self._creatives.get(platform)
+        if creatives is None:
+            creatives = self._creatives[platform] = compile_creatives(platform)
+        return creatives
+
+    def creative(self, platform: str) -> Dict:
+        """Pick a compiled creative for ``platform``"""
+        creatives = self.creatives(platform)
+        return creatives[0] if len(creatives) == 1 else self.rng.choice(creatives)
+
+    def build(self, platform: str, strategy: str, location: Optional[str],
+              budget: float, now: datetime) -> Dict:
+        """Fill a template's variable fields to produce a submission payload"""
+        template = self.template(platform, strategy, location)
+        creatives = template.creatives
+        return dict(
+            template.base,
+            budget=budget * template.budget_share,
+            creative_approach=creatives[0] if len(creatives) == 1 else self.rng.choice(creatives),
+            tracking_id=template.tracking_prefix + self.tracking_stamp(now)
+        )
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Marketing Platform Adapters
+One adapter per ad platform, sharing a pooled keep-alive HTTP session
+"""
+
+import logging
+import random
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from local_server import LocalRequestHandler, LocalServer
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger('StudentAcquisitionAgent.Platforms')
+
+# Simulated acceptance rates per platform
+PLATFORM_SUCCESS_RATES = {
+    'facebook': 0.85,
+    'instagram': 0.80,
+    'tiktok': 0.75,
+    'google_ads': 0.90
+}
+
+
+def create_session(pool_size: int = 32) -> 'requests.Session':
+    """Create an HTTP session with a shared keep-alive connection pool"""
+    # Imported on first use, so simulated runs and one-off commands never load requests
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def simulate_campaign_result(platform: str, campaign_data: Dict, rng: random.Random = random) -> Dict:
+    """Simulate a platform's response to a campaign submission"""
+    success_rate = PLATFORM_SUCCESS_RATES.get(platform, 0.70)
+    success = rng.random() < success_rate
+
+    if success:
+        # Simulate campaign results
+        impressions = rng.randint(5000, 50000)
+        clicks = rng.randint(50, 500)
+        conversions = rng.randint(1, 20)
+
+        return {
+            'success': True,
+            # Platforms never reuse ids; the tracking id keeps simulated ones unique too
+            'campaign_id': f"camp_{campaign_data.get('tracking_id', 'sim')}_{rng.randint(10000, 99999)}",
+            'impressions': impressions,
+            'clicks': clicks,
+            'conversions': conversions,
+            'cost': campaign_data['budget'] * 0.8,  # 80% of budget spent
+            'cpa': campaign_data['budget'] / conversions if conversions > 0 else 0
+        }
+    else:
+        return {
+            'success': False,
+            'error': 'Campaign rejected by platform',
+            'error_code': 'POLICY_VIOLATION' if rng.random() < 0.3 else 'BUDGET_TOO_LOW'
+        }
+
+
+class PlatformAdapter:
+    """Submit campaigns to a marketing platform over HTTP.
+
+    Subclasses set the platform name, endpoint paths and whether the
+    platform accepts several campaigns in one request.
+    """
+
+    name = 'generic'
+    campaigns_path = '/campaigns'
+    batch_path = '/campaigns/batch'
+    supports_batch = False
+    max_batch_size = 1
+
+    def __init__(self, base_url: str, session: Optional['requests.Session'] = None,
+                 timeout: float = 10.0):
+        self.base_url = base_url.rstrip('/')
+        self.session = session or create_session()
+        self.timeout = timeout
+
+    def endpoint(self, path: str) -> str:
+        """Return the full URL for a platform path"""
+        return f"{self.base_url}/{self.name}{path}"
+
+    def build_payload(self, campaign_data: Dict) -> Dict:
+        """Translate agent campaign data into the platform's request body"""
+        return campaign_data
+
+    def submit_campaign(self, campaign_data: Dict) -> Dict:
+        """Submit a single campaign and return the platform response"""
+        response = self.session.post(
+            self.endpoint(self.campaigns_path),
+            json=self.build_payload(campaign_data),
+            timeout=self.timeout
+        )
+        if response.status_code != 200:
+            return self.http_error(response)
+        return response.json()
+
+    def submit_batch(self, campaigns: List[Dict]) -> List[Dict]:
+        """Submit many campaigns, one request per chunk where the platform allows it"""
+        if not self.supports_batch:
+            return [self.submit_campaign(campaign_data) for campaign_data in campaigns]
+
+        results = []
+        for start in range(0, len(campaigns), self.max_batch_size):
+            chunk = campaigns[start:start + self.max_batch_size]
+            response = self.session.post(
+                self.endpoint(self.batch_path),
+                json={'campaigns': [self.build_payload(c) for c in chunk]},
+                timeout=self.timeout
+            )
+            if response.status_code != 200:
+                results.extend([self.http_error(response)] * len(chunk))
+            else:
+                results.extend(response.json()['results'])
+        return results
+
+    @staticmethod
+    def http_error(response: 'requests.Response') -> Dict:
+        return {
+            'success': False,
+            'error': f"Platform returned HTTP {response.status_code}",
+            'error_code': f"HTTP_{response.status_code}"
+        }
+
+
+class FacebookAdapter(PlatformAdapter):
+    """Facebook Marketing API (batch requests of up to 50 calls)"""
+    name = 'facebook'
+    supports_batch = True
+    max_batch_size = 50
+
+
+class InstagramAdapter(PlatformAdapter):
+    """Instagram ads, served through the Facebook Marketing API"""
+    name = 'instagram'
+    supports_batch = True
+    max_batch_size = 50
+
+
+class TikTokAdapter(PlatformAdapter):
+    """TikTok Business API (one campaign per request)"""
+    name = 'tiktok'
+
+
+class GoogleAdsAdapter(PlatformAdapter):
+    """Google Ads API (batched mutate operations)"""
+    name = 'google_ads'
+    supports_batch = True
+    max_batch_size = 100
+
+
+ADAPTER_CLASSES = {
+    cls.name: cls
+    for cls in (FacebookAdapter, InstagramAdapter, TikTokAdapter, GoogleAdsAdapter)
+}
+
+
+class SimulatedPlatformAdapter(PlatformAdapter):
+    """In-process stand-in for a platform, with simulated API latency.
+
+    Pass a seeded ``rng`` and a virtual clock's ``sleep`` for reproducible
+    runs that take no real time.
+    """
+
+    def __init__(self, name: str, supports_batch: bool = False, max_batch_size: int = 1,
+                 latency: tuple = (0.5, 2.0), rng: random.Random = random,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.name = name
+        self.supports_batch = supports_batch
+        self.max_batch_size = max_batch_size
+        self.latency = latency
+        self.rng = rng
+        self.sleep = sleep
+
+    def submit_campaign(self, campaign_data: Dict) -> Dict:
+        # Simulate API delay
+        self.sleep(self.rng.uniform(*self.latency))
+        return simulate_campaign_result(self.name, campaign_data, self.rng)
+
+    def submit_batch(self, campaigns: List[Dict]) -> List[Dict]:
+        if not self.supports_batch:
+            return [self.submit_campaign(campaign_data) for campaign_data in campaigns]
+
+        results = []
+        for start in range(0, len(campaigns), self.max_batch_size):
+            # One round trip per chunk
+            self.sleep(self.rng.uniform(*self.latency))
+            results.extend(
+                simulate_campaign_result(self.name, campaign_data, self.rng)
+                for campaign_data in campaigns[start:start + self.max_batch_size]
+            )
+        return results
+
+
+def build_adapters(platforms: List[str], config: Dict,
+                   session: Optional['requests.Session'] = None,
+                   rng: random.Random = random,
+                   sleep: Callable[[float], None] = time.sleep) -> Dict[str, PlatformAdapter]:
+    """Build one adapter per platform from the ``platform_api`` config section.
+
+    ``mode`` is ``simulated`` (the default, no network) or ``http``, which
+    talks to ``base_url`` through the shared ``session``. Simulated
+    adapters draw from ``rng`` and wait with ``sleep``.
+    """
+    adapters = {}
+    for platform in platforms:
+        adapter_class = ADAPTER_CLASSES.get(platform, PlatformAdapter)
+        if config.get('mode', 'simulated') == 'http':
+            adapter = adapter_class(
+                config.get('base_url', 'http://localhost:8600'),
+                session=session,
+                timeout=config.get('timeout_seconds', 10.0)
+            )
+            adapter.name = platform
+        else:
+            adapter = SimulatedPlatformAdapter(
+                platform,
+                supports_batch=adapter_class.supports_batch,
+                max_batch_size=adapter_class.max_batch_size,
+                rng=rng,
+                sleep=sleep
+            )
+        adapters[platform] = adapter
+    return adapters
+
+
+class _FakePlatformHandler(LocalRequestHandler):
+    def do_POST(self):
+        body = self.read_json()
+        parts = self.path.strip('/').split('/')
+        platform = parts[0]
+
+        time.sleep(self.server.latency)
+        if parts[1:] == ['campaigns']:
+            payload = simulate_campaign_result(platform, body)
+        elif parts[1:] == ['campaigns', 'batch']:
+            payload = {'results': [simulate_campaign_result(platform, c) for c in body['campaigns']]}
+        else:
+            self.send_error(404)
+            return
+        self.send_json(200, payload)
+
+
+class FakePlatformServer(LocalServer):
+    """Local HTTP server speaking the adapter protocol, for offline benchmarks"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.005):
+        super().__init__(_FakePlatformHandler, host, port, latency=latency)
+
+
+def benchmark_throughput(campaigns_per_platform: int = 200, latency: float = 0.005) -> Dict[str, float]:
+    """Compare campaigns/sec for unpooled, pooled and pooled+batched submission"""
+    import requests
+
+    platforms = list(ADAPTER_CLASSES)
+    campaign_data = {'budget': 1000.0, 'strategy': 'free_trial_offer'}
+    total = campaigns_per_platform * len(platforms)
+    results = {}
+
+    with FakePlatformServer(latency=latency) as server:
+        # Current path: a fresh connection for every campaign
+        started = time.perf_counter()
+        for platform in platforms:
+            for _ in range(campaigns_per_platform):
+                requests.post(f"{server.base_url}/{platform}/campaigns", json=campaign_data, timeout=10)
+        results['unpooled'] = total / (time.perf_counter() - started)
+
+        session = create_session()
+        adapters = build_adapters(platforms, {'mode': 'http', 'base_url': server.base_url}, session)
+
+        started = time.perf_counter()
+        for adapter in adapters.values():
+            for _ in range(campaigns_per_platform):
+                adapter.submit_campaign(campaign_data)
+        results['pooled'] = total / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for adapter in adapters.values():
+            adapter.submit_batch([campaign_data] * campaigns_per_platform)
+        results['pooled_batched'] = total / (time.perf_counter() - started)
+        session.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    for path, rate in benchmark_throughput().items():
+        print(f"{path:>15}: {rate:,.0f} campaigns/sec")
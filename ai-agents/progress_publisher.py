@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Progress Publisher
+Delivers agent progress updates off the acquisition cycle with retries
+"""
+
+import atexit
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from fileutil import atomic_write_json
+from local_server import LocalRequestHandler, LocalServer
+
+logger = logging.getLogger('StudentAcquisitionAgent.Progress')
+
+# Statuses worth retrying; anything else in 4xx means the update itself is bad
+RETRYABLE_STATUS = (408, 425, 429, 500, 502, 503, 504)
+
+
+class ProgressPublisher:
+    """Publish progress updates from a background thread.
+
+    ``publish`` never blocks on the network: it records the update as the
+    latest state for its ``agent_id`` and returns. Updates that arrive
+    while an earlier one is pending replace it, since only the newest
+    progress matters. The publisher thread sends pending updates (in one
+    call to ``batch_path`` when several agents are pending and batching is
+    on) and retries failures with exponential backoff and full jitter.
+
+    Undelivered updates are kept in a small JSON outbox, one entry per
+    agent, so progress reported while the backend is down is delivered
+    after a restart.
+    """
+
+    def __init__(self, base_url: str, update_path: str = '/ai-agents/update',
+                 batch_path: str = '/ai-agents/update/batch', batch: bool = False,
+                 timeout: float = 10.0, base_backoff: float = 1.0, max_backoff: float = 300.0,
+                 outbox_path: Optional[str] = 'data/progress_outbox.json',
+                 on_attempt: Optional[Callable[[str, float], None]] = None,
+                 rng: Optional[random.Random] = None):
+        self.base_url = base_url.rstrip('/')
+        self.update_path = update_path
+        self.batch_path = batch_path
+        self.batch = batch
+        self.timeout = timeout
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.outbox_path = outbox_path
+        self.on_attempt = on_attempt
+        self.rng = rng or random.Random()
+
+        self.sent = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+
+        # agent_id -> latest undelivered update
+        self._pending = self._load_outbox()
+        self._outbox_dirty = False
+        self._condition = threading.Condition()
+        self._in_flight = False
+        self._closed = False
+        # Created by the sender thread, which also pays for importing requests
+        self._session = None
+        self._thread = threading.Thread(target=self._run, name='progress-publisher', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, base_url: str, config: Dict,
+                    on_attempt: Optional[Callable[[str, float], None]] = None) -> 'ProgressPublisher':
+        """Build a publisher from the ``progress`` section of the agent config"""
+        return cls(
+            base_url=config.get('base_url', base_url),
+            update_path=config.get('update_path', '/ai-agents/update'),
+            batch_path=config.get('batch_path', '/ai-agents/update/batch'),
+            batch=config.get('batch', False),
+            timeout=config.get('timeout_seconds', 10.0),
+            base_backoff=config.get('base_backoff_seconds', 1.0),
+            max_backoff=config.get('max_backoff_seconds', 300.0),
+            outbox_path=config.get('outbox_path', 'data/progress_outbox.json'),
+            on_attempt=on_attempt
+        )
+
+    @property
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def publish(self, update: Dict):
+        """Queue ``update`` as the latest progress for ``update['agent_id']``"""
+        with self._condition:
+            if self._closed:
+                return
+            if update['agent_id'] in self._pending:
+                self.coalesced += 1
+            self._pending[update['agent_id']] = update
+            self._outbox_dirty = True
+            self._condition.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until nothing is pending; returns False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Try to deliver pending updates, then persist whatever is left"""
+        if self._closed:
+            return
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(self.timeout + 1.0)
+        with self._condition:
+            self._save_outbox()
+        if self._session is not None:
+            self._session.close()
+        atexit.unregister(self.close)
+
+    def _load_outbox(self) -> Dict[str, Dict]:
+        if not self.outbox_path or not os.path.exists(self.outbox_path):
+            return {}
+        try:
+            with open(self.outbox_path, 'r') as f:
+                updates = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable progress outbox {self.outbox_path}: {str(e)}")
+            return {}
+        if updates:
+            logger.info(f"📬 Loaded {len(updates)} undelivered progress update(s)")
+        return {update['agent_id']: update for update in updates}
+
+    def _save_outbox(self):
+        # Caller holds the condition lock
+        if not self.outbox_path or not self._outbox_dirty:
+            return
+        try:
+            atomic_write_json(self.outbox_path, list(self._pending.values()))
+            self._outbox_dirty = False
+        except OSError as e:
+            logger.error(f"❌ Failed to write progress outbox: {str(e)}")
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number ``attempt`` (1-based)"""
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** (attempt - 1)))
+        return self.rng.uniform(0, ceiling)
+
+    def _run(self):
+        retry_at = 0.0
+        while True:
+            with self._condition:
+                while not self._closed and (not self._pending or time.monotonic() < retry_at):
+                    self._condition.wait(max(0.0, retry_at - time.monotonic()) if self._pending else None)
+                if self._closed:
+                    return
+                updates = dict(self._pending)
+                self._in_flight = True
+
+            delivered = self._send(list(updates.values()))
+
+            with self._condition:
+                self._in_flight = False
+                if delivered:
+                    for agent_id, update in updates.items():
+                        # A newer update published meanwhile stays pending
+                        if self._pending.get(agent_id) is update:
+                            del self._pending[agent_id]
+                    self._outbox_dirty = True
+                    self.sent += len(updates)
+                    self.consecutive_failures = 0
+                    retry_at = 0.0
+                else:
+                    self.failures += 1
+                    self.consecutive_failures += 1
+                    delay = self.backoff(self.consecutive_failures)
+                    retry_at = time.monotonic() + delay
+                    logger.warning(f"⚠️ Progress update failed; retrying in {delay:.1f}s")
+                self._save_outbox()
+                self._condition.notify_all()
+
+    def _send(self, updates: List[Dict]) -> bool:
+        """Deliver ``updates``; returns False if they should be retried"""
+        if self.batch and len(updates) > 1:
+            return self._post(self.batch_path, {'updates': updates})
+        return all([self._post(self.update_path, update) for update in updates])
+
+    def _post(self, path: str, body: Dict) -> bool:
+        import requests
+
+        if self._session is None:
+            self._session = requests.Session()
+        started = time.perf_counter()
+        try:
+            response = self._session.post(f"{self.base_url}{path}", json=body, timeout=self.timeout)
+        except requests.RequestException as e:
+            self._report('failed', started)
+            logger.error(f"❌ Progress update failed: {str(e)}")
+            return False
+
+        if response.status_code == 200:
+            self._report('ok', started)
+            return True
+        self._report(f"http_{response.status_code}", started)
+        if response.status_code in RETRYABLE_STATUS:
+            return False
+        # Retrying cannot fix a rejected update; drop it rather than block newer ones
+        logger.warning(f"⚠️ Progress update rejected: {response.status_code}")
+        return True
+
+    def _report(self, status: str, started: float):
+        if self.on_attempt is not None:
+            self.on_attempt(status, time.perf_counter() - started)
+
+
+class _ProgressStubHandler(LocalRequestHandler):
+    def do_POST(self):
+        server = self.server
+        body = self.read_json()
+        if server.latency:
+            time.sleep(server.latency)
+        status = server.status
+        if status == 200:
+            updates = body.get('updates', [body]) if self.path.endswith('/batch') else [body]
+            with server.lock:
+                server.received.extend(updates)
+                server.calls.append(self.path)
+        self.send_json(status, {'success': status == 200})
+
+
+class ProgressStubServer(LocalServer):
+    """Local stand-in for the progress endpoints that records what it receives.
+
+    Set ``status`` to simulate a failing backend and ``latency`` to
+    simulate a slow one.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, status: int = 200):
+        super().__init__(_ProgressStubHandler, host, port, latency=latency, status=status,
+                         received=[], calls=[], lock=threading.Lock())
+
+    @property
+    def received(self) -> List[Dict]:
+        with self.httpd.lock:
+            return list(self.httpd.received)
+
+    @property
+    def calls(self) -> List[str]:
+        with self.httpd.lock:
+            return list(self.httpd.calls)
+
+    def set_status(self, status: int):
+        self.httpd.status = status
+
+    def set_latency(self, latency: float):
+        self.httpd.latency = latency
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    with tempfile.TemporaryDirectory() as tmp, ProgressStubServer(latency=2.0, status=503) as stub:
+        publisher = ProgressPublisher(stub.base_url, batch=True, base_backoff=0.2, max_backoff=1.0,
+                                      outbox_path=os.path.join(tmp, 'outbox.json'))
+        started = time.perf_counter()
+        for cycle in range(100):
+            for agent in ('student_acquisition_agent', 'content_agent'):
+                publisher.publish({'agent_id': agent, 'current_value': cycle})
+        print(f"publish x200 against a slow, failing backend: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+        time.sleep(5)
+        stub.set_status(200)
+        stub.set_latency(0.0)
+        publisher.flush(30)
+        print(f"delivered {len(stub.received)} update(s) in {len(stub.calls)} call(s), "
+              f"coalesced {publisher.coalesced}, failed attempts {publisher.failures}")
+        print(f"latest: {stub.received[-2:]}")
+        publisher.close()
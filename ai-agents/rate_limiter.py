@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Platform Rate Limiter
+Adaptive per-platform token buckets that pace campaign submissions
+"""
+
+import collections
+import logging
+import math
+import threading
+from typing import Dict, Optional
+
+from clock import SystemClock
+
+logger = logging.getLogger('StudentAcquisitionAgent.RateLimit')
+
+# Platform replies meaning the account is over its API quota
+RATE_LIMIT_CODES = frozenset(('RATE_LIMITED', 'QUOTA_EXCEEDED', 'HTTP_429'))
+
+# Shortest wait, so refill rounding at epoch-sized timestamps cannot stall ``acquire``
+MIN_WAIT = 0.001
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, holding at most ``capacity``.
+
+    Time comes from ``clock``, so a virtual clock makes waits free and
+    reproducible. ``consume`` may overdraw the bucket; the debt is paid back
+    before any later caller is admitted.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock=None):
+        self.clock = clock or SystemClock()
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = self.clock.time()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock.time()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self, horizon: float = 0.0) -> float:
+        """Tokens that can be taken now or over the next ``horizon`` seconds"""
+        with self._lock:
+            self._refill()
+            return self.tokens + self.rate * horizon
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """Wait until ``tokens`` are available and take them; False after ``timeout``"""
+        tokens = min(tokens, self.capacity)
+        deadline = None if timeout is None else self.clock.time() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = max(MIN_WAIT, (tokens - self.tokens) / self.rate)
+            if deadline is not None and self.clock.time() + wait > deadline:
+                return False
+            self.clock.sleep(wait)
+
+    def consume(self, tokens: float = 1):
+        """Take ``tokens`` without waiting, overdrawing the bucket if needed"""
+        with self._lock:
+            self._refill()
+            self.tokens -= tokens
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """Token bucket whose rate follows the platform's responses (AIMD).
+
+    Every accepted submission adds ``increase`` tokens/second to the rate,
+    up to ``max_rate``. When ``burst_rejections`` of the last ``window``
+    responses are rejections, the rate is multiplied by ``decrease``; a
+    rate-limit reply does that at once and also empties the bucket. The
+    rate never drops below ``min_rate``.
+    """
+
+    def __init__(self, rate: float, capacity: float, min_rate: float, max_rate: float,
+                 increase: float, decrease: float = 0.5, window: int = 10,
+                 burst_rejections: int = 4, clock=None):
+        super().__init__(rate, capacity, clock)
+        # The starting rate always lies within the adaptive range
+        self.min_rate = min(min_rate, rate)
+        self.max_rate = max(max_rate, rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.burst_rejections = burst_rejections
+        self.accepted = 0
+        self.rejected = 0
+        self.slowdowns = 0
+        self._recent = collections.deque(maxlen=window)
+
+    def record(self, accepted: bool, error_code: Optional[str] = None) -> bool:
+        """Adapt the rate to one response; returns whether the rate was cut"""
+        with self._lock:
+            self._refill()
+            self._recent.append(accepted)
+            if accepted:
+                self.accepted += 1
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                return False
+
+            self.rejected += 1
+            rate_limited = error_code in RATE_LIMIT_CODES
+            if not rate_limited and self._recent.count(False) < self.burst_rejections:
+                return False
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.slowdowns += 1
+            self._recent.clear()
+            if rate_limited:
+                self.tokens = min(self.tokens, 0.0)
+            return True
+
+
+class RateLimiter:
+    """One adaptive token bucket per platform, created on first use.
+
+    Rates are configured in requests per minute, with optional overrides
+    per platform. ``admit`` tells the caller how many requests can start
+    within ``max_wait`` seconds, so a cycle submits only what the platform
+    will take and leaves the rest for later instead of queueing it.
+    """
+
+    def __init__(self, requests_per_minute: float = 60, burst: float = 30,
+                 min_per_minute: float = 6, max_per_minute: float = 120,
+                 increase_per_minute: float = 1, decrease: float = 0.5,
+                 window: int = 10, burst_rejections: int = 4, max_wait: float = 5.0,
+                 platforms: Optional[Dict[str, Dict]] = None, clock=None):
+        self.defaults = {
+            'requests_per_minute': requests_per_minute,
+            'burst': burst,
+            'min_per_minute': min_per_minute,
+            'max_per_minute': max_per_minute,
+            'increase_per_minute': increase_per_minute,
+            'decrease': decrease,
+            'window': window,
+            'burst_rejections': burst_rejections
+        }
+        self.platform_overrides = dict(platforms or {})
+        self.max_wait = max_wait
+        self.clock = clock or SystemClock()
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict, clock=None) -> 'RateLimiter':
+        """Build a limiter from the ``rate_limits`` section of the agent config"""
+        return cls(
+            requests_per_minute=config.get('requests_per_minute', 60),
+            burst=config.get('burst', 30),
+            min_per_minute=config.get('min_per_minute', 6),
+            max_per_minute=config.get('max_per_minute', 120),
+            increase_per_minute=config.get('increase_per_minute', 1),
+            decrease=config.get('decrease', 0.5),
+            window=config.get('window', 10),
+            burst_rejections=config.get('burst_rejections', 4),
+            max_wait=config.get('max_wait_seconds', 5.0),
+            platforms=config.get('platforms'),
+            clock=clock
+        )
+
+    def bucket(self, platform: str) -> AdaptiveTokenBucket:
+        bucket = self._buckets.get(platform)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(platform)
+                if bucket is None:
+                    settings = dict(self.defaults, **self.platform_overrides.get(platform, {}))
+                    bucket = self._buckets[platform] = AdaptiveTokenBucket(
+                        rate=settings['requests_per_minute'] / 60,
+                        capacity=settings['burst'],
+                        min_rate=settings['min_per_minute'] / 60,
+                        max_rate=settings['max_per_minute'] / 60,
+                        increase=settings['increase_per_minute'] / 60,
+                        decrease=settings['decrease'],
+                        window=settings['window'],
+                        burst_rejections=settings['burst_rejections'],
+                        clock=self.clock
+                    )
+        return bucket
+
+    def admit(self, platform: str, wanted: int) -> int:
+        """How many of ``wanted`` requests can start within ``max_wait`` seconds"""
+        return max(0, min(wanted, math.floor(self.bucket(platform).available(self.max_wait))))
+
+    def acquire(self, platform: str, tokens: int = 1) -> bool:
+        """Wait up to ``max_wait`` seconds for a platform's request slot"""
+        return self.bucket(platform).acquire(tokens, timeout=self.max_wait)
+
+    def consume(self, platform: str, tokens: int = 1):
+        self.bucket(platform).consume(tokens)
+
+    def record(self, platform: str, response: Dict):
+        """Feed a platform response back into that platform's rate"""
+        bucket = self.bucket(platform)
+        if bucket.record(bool(response.get('success')), response.get('error_code')):
+            logger.warning(f"🚦 Slowing {platform} to {bucket.rate * 60:.1f} requests/min "
+                           f"after {response.get('error_code', 'rejections')}")
+
+    def rates(self) -> Dict[str, float]:
+        """Current requests per minute of each platform seen so far"""
+        return {platform: bucket.rate * 60 for platform, bucket in self._buckets.items()}
+
+    def restore(self, rates: Dict[str, float]):
+        """Resume adapted rates (requests per minute), clamped to the configured range"""
+        for platform, per_minute in rates.items():
+            bucket = self.bucket(platform)
+            bucket.rate = min(bucket.max_rate, max(bucket.min_rate, per_minute / 60))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {
+            platform: {
+                'requests_per_minute': bucket.rate * 60,
+                'tokens': bucket.available(),
+                'accepted': bucket.accepted,
+                'rejected': bucket.rejected,
+                'slowdowns': bucket.slowdowns
+            }
+            for platform, bucket in self._buckets.items()
+        }
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Streaming Reports
+Date-range and group-by reports over stored campaign and analysis history
+"""
+
+import csv
+import glob
+import gzip
+import json
+import logging
+import os
+import re
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from campaign_store import CampaignResultStore
+from metrics_engine import MetricsEngine
+
+logger = logging.getLogger('StudentAcquisitionAgent.Reports')
+
+GROUP_KEYS = ('platform', 'strategy', 'location')
+
+# Time bucket name -> width in seconds
+INTERVALS = {
+    'hour': 3600,
+    'day': 86400,
+    'week': 7 * 86400
+}
+
+METRIC_FIELDS = ('campaigns', 'impressions', 'clicks', 'conversions', 'cost',
+                 'revenue', 'ctr', 'conversion_rate', 'cpa')
+
+ANALYSIS_FIELDS = ('students_acquired', 'conversion_rate', 'cost_per_acquisition',
+                   'campaigns_active', 'total_revenue')
+
+FORMATS = ('json', 'csv')
+
+# Rotated log suffix written by JsonlLogWriter: day, optional -N, optional .gz
+ROTATED_SUFFIX = re.compile(r'(\d{8})(?:-(\d+))?(?:\.gz)?$')
+
+
+def parse_time(value: Optional[str]) -> Optional[float]:
+    """Parse a ``YYYY-MM-DD`` date or ISO timestamp (local time) into epoch seconds"""
+    if value is None:
+        return None
+    return datetime.fromisoformat(value).timestamp()
+
+
+def campaign_report(engine: MetricsEngine, since: Optional[float] = None,
+                    until: Optional[float] = None, group_by: Sequence[str] = (),
+                    interval: Optional[str] = None) -> Iterator[Dict]:
+    """Yield campaign metrics per group and, with ``interval``, per time period.
+
+    The store is reduced chunk by chunk, so memory depends on the number of
+    groups rather than on how much history is scanned. Rows come out in
+    period order, then group order.
+    """
+    unknown = set(group_by) - set(GROUP_KEYS)
+    if unknown:
+        raise ValueError(f"Cannot group by {sorted(unknown)}; choose from {GROUP_KEYS}")
+    if interval is not None and interval not in INTERVALS:
+        raise ValueError(f"Unknown interval '{interval}'; choose from {sorted(INTERVALS)}")
+
+    width = INTERVALS[interval] if interval else None
+    rows = engine.group_by(tuple(group_by), window=width, since=since, until=until)
+    if width:
+        rows.sort(key=lambda row: row['window_start'])
+
+    for row in rows:
+        record = {}
+        if width:
+            record['period'] = datetime.fromtimestamp(row['window_start']).isoformat()
+        for key in group_by:
+            record[key] = row[key]
+        for field in METRIC_FIELDS:
+            record[field] = row[field]
+        yield record
+
+
+def campaign_rows(store: CampaignResultStore, since: Optional[float] = None,
+                  until: Optional[float] = None) -> Iterator[Dict]:
+    """Yield every stored campaign result in a time range, one dict per row"""
+    columns = ['timestamp', 'platform', 'strategy', 'location',
+               'impressions', 'clicks', 'conversions', 'cost', 'cpa']
+    labels = {key: store.categories(key) for key in GROUP_KEYS}
+    for chunk in store.scan(columns):
+        mask = None
+        if since is not None:
+            mask = chunk['timestamp'] >= since
+        if until is not None:
+            upper = chunk['timestamp'] < until
+            mask = upper if mask is None else mask & upper
+        if mask is not None:
+            chunk = {name: values[mask] for name, values in chunk.items()}
+
+        values = {name: chunk[name].tolist() for name in columns}
+        for index in range(len(values['timestamp'])):
+            code = {key: values[key][index] for key in GROUP_KEYS}
+            # A label added after ``labels`` was read is refreshed once
+            if any(code[key] >= len(labels[key]) for key in GROUP_KEYS):
+                labels = {key: store.categories(key) for key in GROUP_KEYS}
+            yield {
+                'timestamp': datetime.fromtimestamp(values['timestamp'][index]).isoformat(),
+                'platform': labels['platform'][code['platform']],
+                'strategy': labels['strategy'][code['strategy']],
+                'location': labels['location'][code['location']],
+                'impressions': values['impressions'][index],
+                'clicks': values['clicks'][index],
+                'conversions': values['conversions'][index],
+                'cost': values['cost'][index],
+                'cpa': values['cpa'][index]
+            }
+
+
+def rotation_order(path: str, rotated: str) -> Tuple[str, int]:
+    """Sort key of a file rotated from ``path``: ``<path>.<YYYYMMDD>[-N][.gz]``"""
+    match = ROTATED_SUFFIX.match(rotated[len(path) + 1:])
+    if match is None:
+        return '', 0
+    return match.group(1), int(match.group(2) or 0)
+
+
+def analysis_files(log_dir: str, name: str = 'performance_analysis.jsonl') -> List[str]:
+    """The current analysis log and its rotated (possibly gzipped) files, oldest first"""
+    path = os.path.join(log_dir, name)
+    rotated = sorted(glob.glob(glob.escape(path) + '.*'),
+                     key=lambda rotated: (rotation_order(path, rotated), rotated))
+    return rotated + ([path] if os.path.exists(path) else [])
+
+
+def analysis_history(log_dir: str, since: Optional[float] = None,
+                     until: Optional[float] = None) -> Iterator[Dict]:
+    """Yield the KPI snapshot from each logged performance analysis in a time range"""
+    for path in analysis_files(log_dir):
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    analysis = json.loads(line)
+                except ValueError:
+                    # A crash can leave a partial last line
+                    continue
+                timestamp = datetime.fromisoformat(analysis['timestamp']).timestamp()
+                if (since is not None and timestamp < since) or (until is not None and timestamp >= until):
+                    continue
+                record = {'timestamp': analysis['timestamp']}
+                for field in ANALYSIS_FIELDS:
+                    record[field] = analysis['metrics'].get(field)
+                yield record
+
+
+def write_json(rows: Iterable[Dict], out: TextIO) -> int:
+    """Stream ``rows`` to ``out`` as a JSON array; returns the row count"""
+    count = 0
+    out.write('[')
+    for row in rows:
+        out.write(',\n' if count else '\n')
+        out.write(json.dumps(row))
+        count += 1
+    out.write('\n]\n' if count else ']\n')
+    return count
+
+
+def write_csv(rows: Iterable[Dict], out: TextIO) -> int:
+    """Stream ``rows`` to ``out`` as CSV with a header from the first row"""
+    writer = None
+    count = 0
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(out, fieldnames=list(row))
+            writer.writeheader()
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_report(rows: Iterable[Dict], out: TextIO, fmt: str = 'json') -> int:
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown report format '{fmt}'; choose from {FORMATS}")
+    return write_csv(rows, out) if fmt == 'csv' else write_json(rows, out)
+
+
+def save_report(rows: Iterable[Dict], path: str, fmt: str = 'json') -> int:
+    """Stream ``rows`` to ``path``, replacing it only once the report is complete"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as out:
+        count = write_report(rows, out, fmt)
+    os.replace(tmp_path, path)
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream a campaign or analysis history report")
+    parser.add_argument('--kind', choices=('campaigns', 'rows', 'analysis'), default='campaigns',
+                        help="Grouped campaign metrics, raw campaign results, or logged KPI snapshots")
+    parser.add_argument('--since', help="Start date or ISO timestamp (inclusive)")
+    parser.add_argument('--until', help="End date or ISO timestamp (exclusive)")
+    parser.add_argument('--group-by', action='append', choices=GROUP_KEYS, default=[])
+    parser.add_argument('--interval', choices=sorted(INTERVALS))
+    parser.add_argument('--format', choices=FORMATS, default='json')
+    parser.add_argument('--output', help="File to write (default: stdout)")
+    parser.add_argument('--store', default='data/campaign_results')
+    parser.add_argument('--log-dir', default='logs')
+    args = parser.parse_args(argv)
+
+    since, until = parse_time(args.since), parse_time(args.until)
+    store = None
+    if args.kind == 'analysis':
+        rows = analysis_history(args.log_dir, since, until)
+    else:
+        # Read-only: sees what the running agent last committed and never writes
+        store = CampaignResultStore(args.store, read_only=True)
+        if args.kind == 'rows':
+            rows = campaign_rows(store, since, until)
+        else:
+            rows = campaign_report(MetricsEngine(store), since, until, args.group_by, args.interval)
+
+    try:
+        if args.output:
+            count = save_report(rows, args.output, args.format)
+            print(f"Wrote {count} rows to {args.output}", file=sys.stderr)
+        else:
+            write_report(rows, sys.stdout, args.format)
+    except BrokenPipeError:
+        # Output piped into something like ``head`` that stopped reading
+        sys.stderr.close()
+    finally:
+        if store is not None:
+            store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
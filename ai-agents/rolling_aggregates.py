@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Rolling Campaign Aggregates
+Running totals and time-bucketed windows updated as campaign results arrive
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fileutil import atomic_write_json
+from metrics_engine import MetricsEngine, derive_metrics
+
+logger = logging.getLogger('StudentAcquisitionAgent.Aggregates')
+
+# Window name -> (bucket width in seconds, bucket count)
+WINDOWS = {
+    '1h': (60, 60),
+    '6h': (300, 72),
+    '24h': (900, 96),
+    '7d': (3600, 168),
+}
+
+MEASURES = ('campaigns', 'impressions', 'clicks', 'conversions', 'cost')
+KEYS = ('platform', 'strategy')
+
+
+def _empty() -> List[float]:
+    return [0, 0, 0, 0, 0.0]
+
+
+class RollingAggregates:
+    """Incremental campaign aggregates per (platform, strategy).
+
+    Every recorded result updates a running total and one bucket in each
+    window's ring buffer, so reports read O(keys x buckets) state instead
+    of rescanning history. ``rows_seen`` tracks how many stored results
+    are folded in; ``catch_up`` folds in any rows the last snapshot missed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rows_seen = 0
+        self._totals = {}
+        # window -> key -> {bucket id: measures}
+        self._windows = {name: {} for name in WINDOWS}
+
+    def record(self, platform: str, strategy: str, response: Dict,
+               timestamp: Optional[float] = None):
+        """Fold one accepted campaign result into the aggregates"""
+        timestamp = time.time() if timestamp is None else timestamp
+        values = (1, response.get('impressions', 0), response.get('clicks', 0),
+                  response.get('conversions', 0), response.get('cost', 0.0))
+        with self._lock:
+            self._add((platform, strategy), values, timestamp)
+            self.rows_seen += 1
+
+    def _add(self, key: Tuple[str, str], values: Sequence[float], timestamp: float):
+        totals = self._totals.setdefault(key, _empty())
+        for position, value in enumerate(values):
+            totals[position] += value
+
+        for name, (width, count) in WINDOWS.items():
+            bucket = int(timestamp // width)
+            buckets = self._windows[name].setdefault(key, {})
+            measures = buckets.get(bucket)
+            if measures is None:
+                measures = buckets[bucket] = _empty()
+                # Evict buckets that have rolled out of the window
+                for stale in [b for b in buckets if b <= bucket - count]:
+                    del buckets[stale]
+            for position, value in enumerate(values):
+                measures[position] += value
+
+    def totals(self, by: Sequence[str] = ()) -> List[Dict]:
+        """Return all-time metrics grouped by a subset of platform/strategy"""
+        with self._lock:
+            return self._group(self._totals.items(), by)
+
+    def window(self, name: str, by: Sequence[str] = (), now: Optional[float] = None) -> List[Dict]:
+        """Return metrics over one rolling window, grouped like ``totals``"""
+        width, count = WINDOWS[name]
+        current = int((time.time() if now is None else now) // width)
+        with self._lock:
+            items = []
+            for key, buckets in self._windows[name].items():
+                measures = _empty()
+                for bucket, values in buckets.items():
+                    if current - count < bucket <= current:
+                        for position, value in enumerate(values):
+                            measures[position] += value
+                items.append((key, measures))
+            return self._group(items, by)
+
+    @staticmethod
+    def _group(items, by: Sequence[str]) -> List[Dict]:
+        grouped = {}
+        for key, values in items:
+            labels = dict(zip(KEYS, key))
+            group = tuple(labels[name] for name in by)
+            measures = grouped.setdefault(group, _empty())
+            for position, value in enumerate(values):
+                measures[position] += value
+
+        results = []
+        for group, values in sorted(grouped.items()):
+            row = dict(zip(by, group))
+            row.update(zip(MEASURES, values))
+            results.append(derive_metrics(row))
+        if not by and not results:
+            results.append(derive_metrics(dict(zip(MEASURES, _empty()))))
+        return results
+
+    def rank(self, key: str, candidates: Optional[List[str]] = None,
+             window: Optional[str] = None) -> List[str]:
+        """Rank labels of ``key`` by conversions per rand spent, best first"""
+        rows = self.window(window, by=(key,)) if window else self.totals(by=(key,))
+        scored = [
+            (row['conversions'] / row['cost'] if row['cost'] else 0.0, row[key])
+            for row in rows
+            if row['campaigns'] and (candidates is None or row[key] in candidates)
+        ]
+        return [label for _, label in sorted(scored, reverse=True)]
+
+    def catch_up(self, engine: MetricsEngine, now: Optional[float] = None) -> int:
+        """Fold in stored rows past ``rows_seen``; returns how many were added"""
+        now = time.time() if now is None else now
+        with self._lock:
+            start = self.rows_seen
+            stop = len(engine.store)
+            if stop <= start:
+                return 0
+
+            for row in engine.group_by(KEYS, start_row=start, stop_row=stop):
+                totals = self._totals.setdefault((row['platform'], row['strategy']), _empty())
+                for position, measure in enumerate(MEASURES):
+                    totals[position] += row[measure]
+
+            for name, (width, count) in WINDOWS.items():
+                since = (int(now // width) - count + 1) * width
+                for row in engine.group_by(KEYS, window=width, since=since,
+                                           start_row=start, stop_row=stop):
+                    buckets = self._windows[name].setdefault((row['platform'], row['strategy']), {})
+                    measures = buckets.setdefault(int(row['window_start'] // width), _empty())
+                    for position, measure in enumerate(MEASURES):
+                        measures[position] += row[measure]
+
+            self.rows_seen = stop
+            return stop - start
+
+    def save(self, path: str):
+        """Snapshot the aggregates to ``path`` atomically"""
+        with self._lock:
+            snapshot = {
+                'rows_seen': self.rows_seen,
+                'totals': [list(key) + values for key, values in self._totals.items()],
+                'windows': {
+                    name: [
+                        list(key) + [[bucket] + values for bucket, values in buckets.items()]
+                        for key, buckets in keys.items()
+                    ]
+                    for name, keys in self._windows.items()
+                }
+            }
+        atomic_write_json(path, snapshot)
+
+    @classmethod
+    def load(cls, path: str) -> 'RollingAggregates':
+        """Restore aggregates from a snapshot, or start empty if there is none"""
+        aggregates = cls()
+        if not os.path.exists(path):
+            return aggregates
+
+        with open(path) as f:
+            snapshot = json.load(f)
+        aggregates.rows_seen = snapshot['rows_seen']
+        for platform, strategy, *values in snapshot['totals']:
+            aggregates._totals[(platform, strategy)] = values
+        for name, keys in snapshot['windows'].items():
+            if name not in WINDOWS:
+                continue
+            for platform, strategy, *buckets in keys:
+                aggregates._windows[name][(platform, strategy)] = {
+                    bucket: values for bucket, *values in buckets
+                }
+        return aggregates
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Event-Driven Job Scheduler
+Wakes exactly at the next deadline and runs recurring jobs concurrently
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger('StudentAcquisitionAgent.Scheduler')
+
+OVERLAP_POLICIES = ('skip', 'queue', 'cancel')
+
+
+class Job:
+    """A recurring job plus its run-time and lateness statistics"""
+
+    def __init__(self, name: str, interval: float, fn: Callable[[], None], overlap: str = 'skip'):
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"Unknown overlap policy '{overlap}' for job {name}")
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self.overlap = overlap
+        self.next_run = 0.0
+        self.task = None
+        self.queued = False
+
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.cancelled = 0
+        self.total_runtime = 0.0
+        self.last_runtime = 0.0
+        self.max_runtime = 0.0
+        self.last_lateness = 0.0
+        self.max_lateness = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def metrics(self, now: float) -> Dict:
+        return {
+            'interval': self.interval,
+            'overlap': self.overlap,
+            'running': self.running,
+            'queued': self.queued,
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'cancelled': self.cancelled,
+            'last_runtime': self.last_runtime,
+            'mean_runtime': self.total_runtime / self.runs if self.runs else 0.0,
+            'max_runtime': self.max_runtime,
+            'last_lateness': self.last_lateness,
+            'max_lateness': self.max_lateness,
+            'next_run_in': max(0.0, self.next_run - now)
+        }
+
+
+class EventScheduler:
+    """Run recurring jobs from a deadline heap on an asyncio loop.
+
+    The loop sleeps until the earliest deadline (or until a job is added)
+    rather than polling. Jobs run on a thread pool so a long job never
+    delays another job's start. When a job is still running at its next
+    deadline its overlap policy decides: ``skip`` drops that run,
+    ``queue`` runs it once as soon as the current run finishes, and
+    ``cancel`` abandons the current run and starts a new one. Abandoned
+    runs cannot be interrupted mid-call; their thread finishes in the
+    background and their result is ignored.
+    """
+
+    def __init__(self, max_workers: int = 4, shutdown_timeout: float = 30.0):
+        self.max_workers = max_workers
+        self.shutdown_timeout = shutdown_timeout
+        self.jobs = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._loop = None
+        self._wake = None
+        self._stopping = False
+        self._executor = None
+
+    def every(self, seconds: float, fn: Callable[[], None], name: Optional[str] = None,
+              overlap: str = 'skip', run_immediately: bool = False) -> Job:
+        """Register ``fn`` to run every ``seconds``"""
+        job = Job(name or fn.__name__, seconds, fn, overlap)
+        job.next_run = self._now() + (0.0 if run_immediately else seconds)
+        self.jobs[job.name] = job
+        heapq.heappush(self._heap, (job.next_run, next(self._sequence), job))
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        return job
+
+    def _now(self) -> float:
+        return self._loop.time() if self._loop is not None else time.monotonic()
+
+    def metrics(self) -> Dict[str, Dict]:
+        """Return run-time and lateness statistics per job"""
+        now = self._now()
+        return {name: job.metrics(now) for name, job in self.jobs.items()}
+
+    def run(self):
+        """Run until stopped by ``stop`` or SIGINT/SIGTERM"""
+        asyncio.run(self._main())
+
+    def stop(self):
+        """Request a clean shutdown; safe to call from any thread or signal handler"""
+        if self._loop is None:
+            self._stopping = True
+            return
+        self._loop.call_soon_threadsafe(self._request_stop)
+
+    def _request_stop(self):
+        if not self._stopping:
+            logger.info("🛑 Scheduler stopping")
+        self._stopping = True
+        self._wake.set()
+
+    def _install_signal_handlers(self):
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(signum, self._request_stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Windows or a non-main thread: fall back to a plain handler
+                try:
+                    signal.signal(signum, lambda *_: self.stop())
+                except ValueError:
+                    pass
+
+    async def _main(self):
+        # Jobs were registered against time.monotonic(), which asyncio's clock also uses
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        # Room for every job to run alongside one abandoned (cancelled) run of each
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(self.max_workers, 2 * len(self.jobs)),
+            thread_name_prefix='scheduler'
+        )
+        self._install_signal_handlers()
+
+        try:
+            while not self._stopping:
+                delay = self._heap[0][0] - self._loop.time() if self._heap else None
+                if delay is None or delay > 0:
+                    self._wake.clear()
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                deadline, _, job = heapq.heappop(self._heap)
+                self._fire(job, deadline)
+        finally:
+            await self._shutdown()
+
+    def _fire(self, job: Job, deadline: float):
+        now = self._loop.time()
+
+        # Fixed-rate schedule; missed periods are skipped rather than replayed in a burst
+        periods = max(1, int((now - deadline) // job.interval) + 1)
+        job.next_run = deadline + periods * job.interval
+        heapq.heappush(self._heap, (job.next_run, next(self._sequence), job))
+
+        if job.running:
+            if job.overlap == 'skip':
+                job.skipped += 1
+                logger.warning(f"⏭️ Skipping {job.name}: previous run still in progress")
+                return
+            if job.overlap == 'queue':
+                job.queued = True
+                return
+            job.task.cancel()
+            job.cancelled += 1
+            logger.warning(f"⏹️ Cancelled overrunning {job.name}")
+
+        self._start(job, deadline)
+
+    def _start(self, job: Job, scheduled_for: float):
+        job.task = self._loop.create_task(self._run_job(job, scheduled_for))
+
+    async def _run_job(self, job: Job, scheduled_for: float):
+        started = []
+
+        def call():
+            # Lateness is measured when the job actually starts on a worker thread
+            started.append(time.monotonic())
+            job.fn()
+
+        try:
+            await self._loop.run_in_executor(self._executor, call)
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            job.failures += 1
+            logger.error(f"❌ Scheduled job {job.name} failed: {str(e)}")
+        if not started:
+            return
+
+        job.last_lateness = max(0.0, started[0] - scheduled_for)
+        job.max_lateness = max(job.max_lateness, job.last_lateness)
+        runtime = self._loop.time() - started[0]
+        job.runs += 1
+        job.total_runtime += runtime
+        job.last_runtime = runtime
+        job.max_runtime = max(job.max_runtime, runtime)
+
+        if job.queued and not self._stopping:
+            job.queued = False
+            self._start(job, self._loop.time())
+
+    async def _shutdown(self):
+        running = [job.task for job in self.jobs.values() if job.running]
+        if running:
+            logger.info(f"⏳ Waiting for {len(running)} running job(s) to finish")
+            done, pending = await asyncio.wait(running, timeout=self.shutdown_timeout)
+            for task in pending:
+                task.cancel()
+        self._executor.shutdown(wait=False)
+        self._loop = None
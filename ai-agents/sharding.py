@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Campaign Sharding
+Partitions platform x location x strategy campaigns across worker processes
+"""
+
+import logging
+import multiprocessing
+import time
+import zlib
+from functools import partial
+from typing import Dict, List, Optional
+
+from campaign_dispatch import CallToken, CampaignDispatcher
+from platform_adapters import build_adapters, create_session
+
+logger = logging.getLogger('StudentAcquisitionAgent.Sharding')
+
+# Per-process state, set up once by _init_worker
+_worker = {}
+
+# Allowance for spawning a worker and importing its modules before the first call
+WORKER_START_SECONDS = 30.0
+
+
+def unit_key(campaign_data: Dict) -> str:
+    return f"{campaign_data['platform']}|{campaign_data.get('location') or ''}|{campaign_data['strategy']}"
+
+
+def partition(campaigns: List[Dict], shards: int) -> List[List[int]]:
+    """Split campaign indexes into ``shards`` balanced slices.
+
+    Units are ordered by a stable hash of (platform, location, strategy)
+    and dealt round-robin, so slices stay within one campaign of each other
+    however many platforms, locations or strategies are configured, and
+    the assignment does not depend on config ordering.
+    """
+    order = sorted(range(len(campaigns)), key=lambda i: (zlib.crc32(unit_key(campaigns[i]).encode()), i))
+    slices = [[] for _ in range(shards)]
+    for position, index in enumerate(order):
+        slices[position % shards].append(index)
+    return [indexes for indexes in slices if indexes]
+
+
+def _init_worker(platforms: List[str], platform_api: Dict, dispatch: Dict):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    session = None
+    if platform_api.get('mode', 'simulated') == 'http':
+        session = create_session(platform_api.get('pool_size', 32))
+    _worker['adapters'] = build_adapters(platforms, platform_api, session)
+    _worker['dispatcher'] = CampaignDispatcher.from_config(dispatch)
+    _worker['batch_submit'] = platform_api.get('batch_submit', False)
+
+
+def _submit_one(platform: str, campaign_data: Dict, token: CallToken) -> Optional[List[Dict]]:
+    if not token.start():
+        return None
+    return [_worker['adapters'][platform].submit_campaign(campaign_data)]
+
+
+def _submit_batch(platform: str, campaigns: List[Dict], token: CallToken) -> Optional[List[Dict]]:
+    if not token.start():
+        return None
+    return _worker['adapters'][platform].submit_batch(campaigns)
+
+
+def _run_slice(campaigns: List[Dict]) -> Dict:
+    """Submit one slice of campaigns from a worker process"""
+    started = time.monotonic()
+    adapters = _worker['adapters']
+    groups = []
+    calls = []
+
+    by_platform = {}
+    for index, campaign_data in enumerate(campaigns):
+        by_platform.setdefault(campaign_data['platform'], []).append(index)
+    for platform, indexes in by_platform.items():
+        if _worker['batch_submit'] and adapters[platform].supports_batch:
+            groups.append(indexes)
+            calls.append((platform, partial(_submit_batch, platform, [campaigns[i] for i in indexes])))
+        else:
+            for index in indexes:
+                groups.append([index])
+                calls.append((platform, partial(_submit_one, platform, campaigns[index])))
+
+    outcomes = [None] * len(campaigns)
+    for indexes, outcome in zip(groups, _worker['dispatcher'].dispatch(calls)):
+        responses = outcome['value'] or [None] * len(indexes)
+        for index, response in zip(indexes, responses):
+            # A late response has no way back from the worker, so it stays a timeout
+            outcomes[index] = dict(outcome, value=response, pending=False)
+
+    return {'outcomes': outcomes, 'elapsed': time.monotonic() - started}
+
+
+class ShardCoordinator:
+    """Fan campaign submissions out to a pool of worker processes.
+
+    Workers only talk to the ad platforms. The coordinator builds the
+    payloads, sends each worker its slice, and returns one outcome per
+    campaign in the original order, so all results, metrics and progress
+    updates stay in the coordinating process.
+
+    Each slice must finish within ``call_timeout_seconds`` per campaign plus
+    ``WORKER_START_SECONDS``. A slice that misses its deadline or fails is
+    reported as failed and the pool is replaced, so a dead worker cannot
+    stall later cycles.
+    """
+
+    def __init__(self, workers: int, platforms: List[str], platform_api: Dict, dispatch: Dict):
+        self.workers = workers
+        self.call_timeout = dispatch.get('call_timeout_seconds', 10.0)
+        self._initargs = (platforms, platform_api, dispatch)
+        self._pool = self._start_pool()
+
+    def _start_pool(self):
+        # spawn: the agent process already runs background threads
+        return multiprocessing.get_context('spawn').Pool(
+            self.workers, initializer=_init_worker, initargs=self._initargs
+        )
+
+    def slice_timeout(self, campaigns: int) -> float:
+        """Longest a worker may take to submit a slice of ``campaigns``"""
+        return WORKER_START_SECONDS + self.call_timeout * campaigns
+
+    def execute(self, campaigns: List[Dict]) -> List[Dict]:
+        """Submit ``campaigns`` across the workers; returns dispatcher-style outcomes"""
+        slices = partition(campaigns, self.workers)
+        started = time.monotonic()
+        pending = [
+            (indexes, self._pool.apply_async(_run_slice, ([campaigns[i] for i in indexes],)))
+            for indexes in slices
+        ]
+
+        outcomes = [None] * len(campaigns)
+        failed = False
+        for shard, (indexes, result) in enumerate(pending):
+            # Slices run side by side, so each deadline counts from the same start
+            remaining = started + self.slice_timeout(len(indexes)) - time.monotonic()
+            try:
+                shard_result = result.get(max(0.0, remaining))
+            except Exception as e:
+                failed = True
+                timed_out = isinstance(e, multiprocessing.TimeoutError)
+                error = f"shard timed out after {self.slice_timeout(len(indexes)):.1f}s" if timed_out else str(e)
+                logger.error(f"❌ Shard {shard} failed: {error}")
+                for index in indexes:
+                    outcomes[index] = {'value': None, 'error': error, 'timed_out': timed_out,
+                                       'pending': False, 'elapsed': time.monotonic() - started}
+                continue
+            for index, outcome in zip(indexes, shard_result['outcomes']):
+                outcomes[index] = outcome
+            logger.info(f"🧩 Shard {shard}: {len(indexes)} campaigns in {shard_result['elapsed']:.2f}s")
+
+        if failed:
+            logger.warning("🔁 Replacing the shard worker pool after a failed shard")
+            self._pool.terminate()
+            self._pool = self._start_pool()
+        return outcomes
+
+    def close(self):
+        """Stop the worker processes"""
+        self._pool.close()
+        self._pool.join()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Deterministic Agent Simulation
+Drives the agent's scheduled jobs through days of virtual time in seconds
+"""
+
+import copy
+import heapq
+import itertools
+import logging
+import os
+import random
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from clock import VirtualClock
+from progress_publisher import ProgressStubServer
+from scheduler import Job
+
+logger = logging.getLogger('StudentAcquisitionAgent.Simulation')
+
+# Fixed start so simulated dates (tracking ids, report names) repeat across runs
+SIMULATION_EPOCH = 1767225600.0  # 2026-01-01 00:00 UTC
+
+
+class VirtualScheduler:
+    """Stand-in for ``EventScheduler`` that runs jobs one at a time in virtual time.
+
+    Jobs run in deadline order on the calling thread. The clock jumps to
+    each deadline, and simulated API latency inside a job moves it further,
+    so lateness and run times are reported in virtual seconds. Overlap
+    policies are accepted for compatibility; with serial execution a job is
+    never still running at its next deadline.
+    """
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self.jobs = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._stopping = False
+
+    def every(self, seconds: float, fn: Callable[[], None], name: Optional[str] = None,
+              overlap: str = 'skip', run_immediately: bool = False) -> Job:
+        job = Job(name or fn.__name__, seconds, fn, overlap)
+        job.next_run = self.clock.time() + (0.0 if run_immediately else seconds)
+        self.jobs[job.name] = job
+        heapq.heappush(self._heap, (job.next_run, next(self._sequence), job))
+        return job
+
+    def metrics(self) -> Dict[str, Dict]:
+        now = self.clock.time()
+        return {name: job.metrics(now) for name, job in self.jobs.items()}
+
+    def stop(self):
+        self._stopping = True
+
+    def run_until(self, end: float, on_job: Optional[Callable[[Job], None]] = None):
+        """Run every job due before ``end``, calling ``on_job`` after each run"""
+        while self._heap and not self._stopping and self._heap[0][0] < end:
+            deadline, _, job = heapq.heappop(self._heap)
+            self.clock.advance_to(deadline)
+            started = self.clock.time()
+
+            try:
+                job.fn()
+            except Exception as e:
+                job.failures += 1
+                logger.error(f"❌ Simulated job {job.name} failed: {str(e)}")
+
+            runtime = self.clock.time() - started
+            job.runs += 1
+            job.total_runtime += runtime
+            job.last_runtime = runtime
+            job.max_runtime = max(job.max_runtime, runtime)
+            job.last_lateness = started - deadline
+            job.max_lateness = max(job.max_lateness, job.last_lateness)
+
+            # Fixed-rate, skipping periods missed while the job ran
+            periods = max(1, int((self.clock.time() - deadline) // job.interval) + 1)
+            job.skipped += periods - 1
+            job.next_run = deadline + periods * job.interval
+            heapq.heappush(self._heap, (job.next_run, next(self._sequence), job))
+
+            if on_job is not None:
+                on_job(job)
+        self.clock.advance_to(end)
+
+
+def simulation_config(base: Dict, root: str, overrides: Optional[Dict] = None) -> Dict:
+    """Copy an agent config, keeping all state under ``root`` and execution serial"""
+    config = copy.deepcopy(base)
+    for section, values in (overrides or {}).items():
+        if isinstance(values, dict):
+            config.setdefault(section, {}).update(values)
+        else:
+            config[section] = values
+
+    config.setdefault('dispatch', {})['max_workers'] = 0
+    config.setdefault('sharding', {})['workers'] = 0
+    config.setdefault('platform_api', {})['mode'] = 'simulated'
+    config.setdefault('results_store', {}).update({
+        'path': os.path.join(root, 'data', 'campaign_results'),
+        'aggregates_path': os.path.join(root, 'data', 'rolling_aggregates.json')
+    })
+    config.setdefault('campaign_registry', {})['path'] = os.path.join(root, 'data', 'campaign_registry.json')
+    config.setdefault('state', {})['path'] = os.path.join(root, 'data', 'agent_state.bin')
+    config.setdefault('log_writer', {})['log_dir'] = os.path.join(root, 'logs')
+    config.setdefault('reports', {})['dir'] = os.path.join(root, 'reports')
+    config.setdefault('progress', {})['outbox_path'] = None
+    config.setdefault('metrics', {})['port'] = None
+    config.setdefault('config_reload', {})['interval_seconds'] = 0
+    return config
+
+
+def run_simulation(days: float = 7, seed: int = 0, overrides: Optional[Dict] = None,
+                   workdir: Optional[str] = None) -> Dict:
+    """Run the agent's schedule for ``days`` of virtual time and summarize the run.
+
+    The same ``seed`` and ``overrides`` give the same students, spend and
+    time-to-target on every run. State is written under ``workdir``, or a
+    temporary directory that is removed afterwards.
+    """
+    from student_acquisition import StudentAcquisitionAgent
+
+    with tempfile.TemporaryDirectory(prefix='agent-sim-') as scratch, ProgressStubServer() as stub:
+        root = workdir or scratch
+        os.makedirs(os.path.join(root, 'reports'), exist_ok=True)
+        config = simulation_config(StudentAcquisitionAgent.load_config(), root, overrides)
+        config['progress']['base_url'] = stub.base_url
+
+        clock = VirtualClock(SIMULATION_EPOCH)
+        agent = StudentAcquisitionAgent(config=config, clock=clock, rng=random.Random(seed))
+        agent.scheduler = VirtualScheduler(clock)
+        agent.schedule_tasks()
+
+        reached = {}
+
+        def check_target(job: Job):
+            if 'at' not in reached and agent.aggregates.totals()[0]['conversions'] >= agent.target_students:
+                reached['at'] = clock.time()
+
+        started = time.perf_counter()
+        try:
+            agent.scheduler.run_until(SIMULATION_EPOCH + days * 86400, on_job=check_target)
+        finally:
+            wall_seconds = time.perf_counter() - started
+            agent.close()
+
+        totals = agent.aggregates.totals()[0]
+        cycles = agent.scheduler.jobs['acquisition_cycle'].runs
+        outcomes = agent.metrics.campaigns_total.snapshot()
+        throttled = sum(count for key, count in outcomes.items() if key.endswith('|throttled'))
+        submitted = sum(outcomes.values()) - throttled
+        return {
+            'seed': seed,
+            'days': days,
+            'wall_seconds': wall_seconds,
+            'cycles': cycles,
+            'campaigns_submitted': submitted,
+            'campaigns_accepted': totals['campaigns'],
+            'campaigns_throttled': throttled,
+            'students': totals['conversions'],
+            'spend': totals['cost'],
+            'cycles_per_sec': cycles / wall_seconds if wall_seconds else 0.0,
+            'campaigns_per_sec': submitted / wall_seconds if wall_seconds else 0.0,
+            'time_to_target_hours': (reached['at'] - SIMULATION_EPOCH) / 3600 if reached else None,
+            'simulated_latency_seconds': clock.slept,
+            'jobs': agent.scheduler.metrics()
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Run a seeded, virtual-time simulation of the agent")
+    parser.add_argument('--days', type=float, default=7)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', help="Keep the simulated agent's state here (default: discard it)")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run_simulation(args.days, args.seed, workdir=args.workdir), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(main())
@@ -4,34 +4,70 @@ Student Acquisition AI Agent
 Target: Acquire 2000 paying students in 7 days
 """
 
-import schedule
+import os
+import math
+import collections
 import time
-import requests
 import json
 import random
 import logging
-from datetime import datetime, timedelta
+import copy
+import threading
+from functools import partial
 from typing import Dict, List, Optional
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/student_acquisition.log'),
-        logging.StreamHandler()
-    ]
-)
+from campaign_dispatch import CallToken, CampaignDispatcher
+from platform_adapters import build_adapters, create_session
+from log_writer import JsonlLogWriter
+from campaign_store import CampaignResultStore
+from metrics_engine import MetricsEngine
+from rolling_aggregates import RollingAggregates, WINDOWS, KEYS
+from budget_allocator import build_allocator
+from scheduler import EventScheduler
+from sharding import ShardCoordinator, partition
+from instrumentation import AgentMetrics
+from progress_publisher import ProgressPublisher
+from clock import SystemClock
+from campaign_registry import CampaignRegistry
+from payload_templates import PayloadTemplateCache
+from reports import campaign_report, save_report
+from rate_limiter import RateLimiter
+from config_watcher import ConfigWatcher, RESTART_SECTIONS, changed_sections, load_config_file
+from agent_state import StateStore, digest
 
 logger = logging.getLogger('StudentAcquisitionAgent')
 
+CONFIG_PATH = 'config/student_acquisition_config.json'
+
+# Config sections the agent tunes itself and carries across restarts
+LEARNED_SECTIONS = ('campaign_strategies', 'targeting')
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def configure_logging(log_dir: Optional[str] = 'logs', level: str = 'INFO'):
+    """Log to stderr and, with a ``log_dir``, to the agent's log file there.
+    
+    Called by the command that runs the agent rather than at import time, so
+    importing this module has no side effects.
+    """
+    handlers = [logging.StreamHandler()]
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+        handlers.append(logging.FileHandler(os.path.join(log_dir, 'student_acquisition.log')))
+    logging.basicConfig(level=level.upper(), format=LOG_FORMAT, handlers=handlers)
+
+
 class StudentAcquisitionAgent:
-    def __init__(self):
+    def __init__(self, config: Optional[Dict] = None, clock=None, rng: Optional[random.Random] = None):
         self.agent_id = "student_acquisition_v1"
         self.target_students = 2000
         self.timeframe_days = 7
         self.base_url = "http://localhost:3000/api"
-        self.config = self.load_config()
+        self.config = config if config is not None else self.load_config()
+        # Injected by the simulation for seeded, virtual-time runs
+        self.clock = clock or SystemClock()
+        self.rng = rng or random.Random()
         self.performance_metrics = {
             'students_acquired': 0,
             'conversion_rate': 0.0,
@@ -39,12 +75,86 @@ class StudentAcquisitionAgent:
             'campaigns_active': 0,
             'total_revenue': 0.0
         }
+        self.dispatcher = CampaignDispatcher.from_config(self.config.get('dispatch', {}))
+        platform_api = self.config.get('platform_api', {})
+        self.http_session = None
+        self.adapters = self.build_platform_adapters(self.config['platforms'], platform_api)
+        self.batch_submit = platform_api.get('batch_submit', False)
+        # Paces submissions per platform and adapts to how each one responds
+        self.rate_limiter = RateLimiter.from_config(self.config.get('rate_limits', {}), clock=self.clock)
+        self.log_writer = JsonlLogWriter.from_config(self.config.get('log_writer', {}))
+        self.log_dir = self.config.get('log_writer', {}).get('log_dir', 'logs')
+        self.reports_dir = self.config.get('reports', {}).get('dir', 'reports')
+        store_config = self.config.get('results_store', {})
+        self.results_store = CampaignResultStore(
+            store_config.get('path', 'data/campaign_results'),
+            segment_rows=store_config.get('segment_rows', 65536)
+        )
+        self.metrics_engine = MetricsEngine(self.results_store)
+        self.metrics_breakdown = []
+        
+        # Resume rolling aggregates from the last snapshot, folding in any newer results
+        self.aggregates_path = store_config.get('aggregates_path', 'data/rolling_aggregates.json')
+        self.aggregates = RollingAggregates.load(self.aggregates_path)
+        replayed = self.aggregates.catch_up(self.metrics_engine, now=self.clock.time())
+        if replayed:
+            logger.info(f"📥 Folded {replayed} stored results into rolling aggregates")
+        
+        self.allocator = self.build_budget_allocator(self.config)
+        self.budget_allocation = {}
+        self.payload_templates = PayloadTemplateCache(self.config, rng=self.rng)
+        
+        # Campaigns still running, indexed so monitoring only visits threshold crossings
+        registry_config = self.config.get('campaign_registry', {})
+        self.registry_path = registry_config.get('path', 'data/campaign_registry.json')
+        self.campaign_registry = CampaignRegistry.load(
+            self.registry_path, ttl=registry_config.get('ttl_hours', 24) * 3600
+        )
+        self.scheduler = None
+        self.shard_coordinator = None
+        
+        # Config edits are staged by the watcher and swapped in between cycles
+        self.config_watcher = ConfigWatcher(CONFIG_PATH)
+        # The config as last read from the file; reloads are diffed against it, not the tuned one
+        self.file_config = copy.deepcopy(self.config)
+        self.pending_config = None
+        self.cycle_lock = threading.Lock()
         
-    def load_config(self) -> Dict:
+        # Learned state survives restarts: a compact snapshot plus a log of deltas
+        state_config = self.config.get('state', {})
+        self.config_digest = self.learned_digest(self.file_config)
+        self.state_store = StateStore(
+            state_config.get('path', 'data/agent_state.bin'),
+            snapshot_every=state_config.get('snapshot_every', 50)
+        )
+        self.restore_state()
+        
+        # Instrumentation; queue depths and progress are read on scrape
+        self.metrics = AgentMetrics.from_config(self.config.get('metrics', {}))
+        self.log_writer.on_flush = self.record_log_flush
+        self.metrics.gauge('jsonl_queue_depth', 'Records waiting in the JSONL writer queue',
+                           lambda: self.log_writer.queue_depth)
+        self.metrics.gauge('jsonl_records_written', 'Records written by the JSONL writer',
+                           lambda: self.log_writer.records_written)
+        self.metrics.gauge('jsonl_records_dropped', 'Records dropped because the JSONL queue was full',
+                           lambda: self.log_writer.records_dropped)
+        self.metrics.gauge('dispatch_in_flight', 'Campaign calls currently running',
+                           lambda: self.dispatcher.in_flight)
+        self.metrics.gauge('students_acquired', 'Students acquired so far',
+                           lambda: self.performance_metrics['students_acquired'])
+        
+        # Progress goes out from a background publisher so a slow backend never stalls a cycle
+        self.progress_publisher = ProgressPublisher.from_config(
+            self.base_url, self.config.get('progress', {}), on_attempt=self.record_progress_attempt
+        )
+        self.metrics.gauge('progress_updates_pending', 'Progress updates waiting for delivery',
+                           lambda: self.progress_publisher.pending)
+        
+    @staticmethod
+    def load_config() -> Dict:
         """Load agent configuration"""
         try:
-            with open('config/student_acquisition_config.json', 'r') as f:
-                return json.load(f)
+            return load_config_file(CONFIG_PATH)
         except FileNotFoundError:
             return {
                 "platforms": ["facebook", "instagram", "tiktok", "google_ads"],
@@ -60,7 +170,103 @@ class StudentAcquisitionAgent:
                     "webinar_signup",
                     "content_marketing",
                     "influencer_partnerships"
-                ]
+                ],
+                "dispatch": {
+                    "max_workers": 16,
+                    "per_platform_concurrency": 4,
+                    "call_timeout_seconds": 10,
+                    "platform_concurrency": {}
+                },
+                "platform_api": {
+                    "mode": "simulated",
+                    "base_url": "http://localhost:8600",
+                    "pool_size": 32,
+                    "timeout_seconds": 10,
+                    "batch_submit": False
+                },
+                "log_writer": {
+                    "max_queue": 10000,
+                    "flush_records": 500,
+                    "flush_interval_seconds": 1.0,
+                    "log_dir": "logs",
+                    "max_bytes": 52428800,
+                    "rotate_daily": True,
+                    "compress": False
+                },
+                "results_store": {
+                    "path": "data/campaign_results",
+                    "segment_rows": 65536,
+                    "aggregates_path": "data/rolling_aggregates.json"
+                },
+                "budget_allocator": {
+                    "policy": "thompson",
+                    "prior_conversions_per_rand": 0.005,
+                    "prior_spend": 2000,
+                    "explore_share": 0.2,
+                    "greed": 2.0
+                },
+                "scheduler": {
+                    "max_workers": 4,
+                    "shutdown_timeout_seconds": 30,
+                    "overlap": {
+                        "acquisition_cycle": "skip",
+                        "analyze_performance": "queue",
+                        "optimize_strategies": "skip",
+                        "daily_report": "queue",
+                        "trend_report": "skip"
+                    }
+                },
+                "sharding": {
+                    "workers": 0
+                },
+                "campaign_registry": {
+                    "path": "data/campaign_registry.json",
+                    "ttl_hours": 24,
+                    "pause_cpa_multiplier": 1.5,
+                    "scale_conversion_rate": 0.05,
+                    "scale_multiplier": 1.2
+                },
+                "reports": {
+                    "dir": "reports",
+                    "trend_interval_hours": 24,
+                    "trend_days": 28,
+                    "trend_group_by": ["platform"],
+                    "trend_period": "day",
+                    "trend_format": "csv"
+                },
+                "progress": {
+                    "timeout_seconds": 10,
+                    "base_backoff_seconds": 1,
+                    "max_backoff_seconds": 300,
+                    "outbox_path": "data/progress_outbox.json",
+                    "batch": False
+                },
+                "rate_limits": {
+                    "requests_per_minute": 60,
+                    "burst": 30,
+                    "min_per_minute": 6,
+                    "max_per_minute": 120,
+                    "increase_per_minute": 1,
+                    "decrease": 0.5,
+                    "window": 10,
+                    "burst_rejections": 4,
+                    "max_wait_seconds": 5,
+                    "platforms": {}
+                },
+                "config_reload": {
+                    "interval_seconds": 10
+                },
+                "state": {
+                    "path": "data/agent_state.bin",
+                    "checkpoint_interval_seconds": 300,
+                    "snapshot_every": 50
+                },
+                "metrics": {
+                    "mode": "sampled",
+                    "sample_rate": 0.1,
+                    "host": "127.0.0.1",
+                    "port": 9108
+                }
             }
     
     def start(self):
@@ -68,33 +274,84 @@ class StudentAcquisitionAgent:
         logger.info("🚀 Starting Student Acquisition AI Agent")
         logger.info(f"🎯 Target: {self.target_students} students in {self.timeframe_days} days")
         
-        # Schedule tasks
-        self.schedule_tasks()
+        scheduler_config = self.config.get('scheduler', {})
+        self.scheduler = EventScheduler(
+            max_workers=scheduler_config.get('max_workers', 4),
+            shutdown_timeout=scheduler_config.get('shutdown_timeout_seconds', 30)
+        )
         
-        # Run initial acquisition cycle
-        self.run_acquisition_cycle()
+        metrics_config = self.config.get('metrics', {})
+        if self.metrics.enabled and metrics_config.get('port'):
+            try:
+                self.metrics.serve(metrics_config.get('host', '127.0.0.1'), metrics_config['port'])
+            except OSError as e:
+                logger.error(f"❌ Metrics endpoint failed to start: {str(e)}")
+        
+        # Schedule tasks; the first acquisition cycle runs immediately
+        self.schedule_tasks()
         
-        # Keep the agent running
+        # Keep the agent running until SIGINT/SIGTERM
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-        except KeyboardInterrupt:
-            logger.info("🛑 Agent stopped by user")
+            self.scheduler.run()
+            logger.info("🛑 Agent stopped")
+            logger.info(f"⏱️ Job metrics: {json.dumps(self.scheduler.metrics())}")
+        finally:
+            self.close()
+    
+    def close(self):
+        """Release workers and connections and persist state"""
+        if self.shard_coordinator:
+            self.shard_coordinator.close()
+        # Wait for late responses so they are in the final persist and checkpoint
+        self.dispatcher.shutdown(wait=True)
+        if self.http_session is not None:
+            self.http_session.close()
+        self.log_writer.close()
+        self.persist_results()
+        self.results_store.close()
+        # The final checkpoint carries totals up to the last accepted campaign
+        self.calculate_metrics()
+        self.checkpoint_state()
+        self.state_store.close()
+        self.progress_publisher.close()
+        self.metrics.close()
     
     def schedule_tasks(self):
         """Schedule recurring tasks"""
+        overlap = self.config.get('scheduler', {}).get('overlap', {})
+        hour = 3600
+        
         # Run acquisition cycle every 4 hours
-        schedule.every(4).hours.do(self.run_acquisition_cycle)
+        self.scheduler.every(4 * hour, self.run_acquisition_cycle, name='acquisition_cycle',
+                             overlap=overlap.get('acquisition_cycle', 'skip'), run_immediately=True)
         
         # Performance analysis every 6 hours
-        schedule.every(6).hours.do(self.analyze_performance)
+        self.scheduler.every(6 * hour, self.analyze_performance, name='analyze_performance',
+                             overlap=overlap.get('analyze_performance', 'queue'))
         
         # Strategy optimization every 12 hours
-        schedule.every(12).hours.do(self.optimize_strategies)
+        self.scheduler.every(12 * hour, self.optimize_strategies, name='optimize_strategies',
+                             overlap=overlap.get('optimize_strategies', 'skip'))
         
         # Report generation every 24 hours
-        schedule.every(24).hours.do(self.generate_daily_report)
+        self.scheduler.every(24 * hour, self.generate_daily_report, name='daily_report',
+                             overlap=overlap.get('daily_report', 'queue'))
+        
+        # Pick up config file edits without a restart
+        reload_seconds = self.config.get('config_reload', {}).get('interval_seconds', 10)
+        if reload_seconds:
+            self.scheduler.every(reload_seconds, self.check_config, name='config_reload', overlap='skip')
+        
+        # Checkpoint learned state; unchanged state costs nothing
+        checkpoint_seconds = self.config.get('state', {}).get('checkpoint_interval_seconds', 300)
+        if checkpoint_seconds:
+            self.scheduler.every(checkpoint_seconds, self.checkpoint_state, name='checkpoint_state', overlap='skip')
+        
+        # Multi-week trend report streamed from the results store
+        trend_hours = self.config.get('reports', {}).get('trend_interval_hours', 24)
+        if trend_hours:
+            self.scheduler.every(trend_hours * hour, self.generate_trend_report, name='trend_report',
+                                 overlap=overlap.get('trend_report', 'skip'))
         
         logger.info("📅 Scheduled tasks initialized")
     
@@ -103,182 +360,433 @@ class StudentAcquisitionAgent:
         logger.info("🔄 Running student acquisition cycle")
         
         try:
-            # 1. Analyze current performance
-            self.update_performance_metrics()
-            
-            # 2. Execute marketing campaigns
-            campaigns_executed = self.execute_marketing_campaigns()
-            
-            # 3. Monitor and optimize in real-time
-            self.monitor_campaigns()
-            
-            # 4. Update progress
-            self.update_progress()
-            
+            with self.cycle_lock, self.metrics.timer(self.metrics.cycle_seconds, sample=False):
+                self.apply_pending_config()
+                campaigns_executed = self._run_acquisition_steps()
+            self.metrics.cycles_total.inc(status='ok')
             logger.info(f"✅ Acquisition cycle completed. Campaigns executed: {campaigns_executed}")
             
         except Exception as e:
+            self.metrics.cycles_total.inc(status='error')
             logger.error(f"❌ Acquisition cycle failed: {str(e)}")
     
+    def check_config(self):
+        """Stage an edited config file, applying it now unless a cycle is running"""
+        new_config = self.config_watcher.poll()
+        if new_config is not None:
+            self.pending_config = new_config
+        if self.pending_config is not None and self.cycle_lock.acquire(blocking=False):
+            try:
+                self.apply_pending_config()
+            finally:
+                self.cycle_lock.release()
+    
+    def apply_pending_config(self):
+        """Swap in a staged config; called only between cycles"""
+        new_config, self.pending_config = self.pending_config, None
+        if new_config is not None:
+            self.apply_config(new_config)
+    
+    def apply_config(self, file_config: Dict):
+        """Replace the config, rebuilding only what the changed sections feed.
+        
+        The new file is diffed against the previous file, not the running
+        config, so tuned strategies and targeting are replaced only when the
+        edit touched them. Other learned state (performance metrics,
+        aggregates, allocator evidence and the campaign registry) is kept.
+        If rebuilding fails the old config stays in place.
+        """
+        started = time.perf_counter()
+        changed = changed_sections(self.file_config, file_config)
+        if not changed:
+            return
+        
+        new_config = dict(file_config)
+        for key in LEARNED_SECTIONS:
+            if key not in changed and key in self.config:
+                new_config[key] = self.config[key]
+        
+        # Build everything first, so a failure leaves the running config untouched
+        try:
+            adapters, batch_submit = self.adapters, self.batch_submit
+            if changed & {'platforms', 'platform_api'}:
+                platform_api = new_config.get('platform_api', {})
+                adapters = self.build_platform_adapters(new_config['platforms'], platform_api)
+                batch_submit = platform_api.get('batch_submit', False)
+            dispatcher = self.dispatcher
+            if 'dispatch' in changed:
+                dispatcher = CampaignDispatcher.from_config(new_config.get('dispatch', {}))
+            allocator = self.allocator
+            if 'budget_allocator' in changed:
+                allocator = self.build_budget_allocator(new_config)
+            rate_limiter = self.rate_limiter
+            if 'rate_limits' in changed:
+                rate_limiter = RateLimiter.from_config(new_config.get('rate_limits', {}), clock=self.clock)
+                # Adapted rates carry over, clamped to the new range
+                rate_limiter.restore(self.rate_limiter.rates())
+            registry_ttl = new_config.get('campaign_registry', {}).get('ttl_hours', 24) * 3600
+            reports_dir = new_config.get('reports', {}).get('dir', 'reports')
+        except Exception as e:
+            logger.error(f"❌ Config reload failed, keeping the current config: {str(e)}")
+            return
+        
+        if changed & {'platforms', 'platform_api', 'dispatch', 'sharding'} and self.shard_coordinator:
+            # Workers hold their own adapters; the next sharded cycle starts fresh ones
+            self.shard_coordinator.close()
+            self.shard_coordinator = None
+        if dispatcher is not self.dispatcher:
+            self.dispatcher.shutdown(wait=False)
+        
+        self.adapters, self.batch_submit = adapters, batch_submit
+        self.dispatcher = dispatcher
+        self.allocator = allocator
+        self.rate_limiter = rate_limiter
+        self.campaign_registry.ttl = registry_ttl
+        self.reports_dir = reports_dir
+        self.config = new_config
+        self.file_config = copy.deepcopy(file_config)
+        self.config_digest = self.learned_digest(file_config)
+        if changed & {'platforms', 'campaign_strategies', 'daily_budget', 'budget_allocator'}:
+            self.budget_allocation = {}
+        if 'targeting' in changed:
+            self.payload_templates.invalidate(new_config)
+        else:
+            self.payload_templates.config = new_config
+        
+        restart = changed & RESTART_SECTIONS
+        if restart:
+            logger.warning(f"⚠️ Config sections {sorted(restart)} take effect after a restart")
+        elapsed = (time.perf_counter() - started) * 1000
+        logger.info(f"🔧 Config reloaded in {elapsed:.1f} ms; changed: {sorted(changed)}")
+    
+    @staticmethod
+    def learned_digest(config: Dict) -> str:
+        """Digest of the config sections the agent tunes, as loaded from the file"""
+        return digest({key: config.get(key) for key in LEARNED_SECTIONS})
+    
+    def checkpoint_state(self):
+        """Log whatever learned state changed since the last checkpoint"""
+        state = {
+            'performance_metrics': self.performance_metrics,
+            'config_digest': self.config_digest,
+            'config': {key: self.config[key] for key in LEARNED_SECTIONS if key in self.config},
+            'rate_limits': self.rate_limiter.rates()
+        }
+        try:
+            self.state_store.save(state)
+        except Exception as e:
+            logger.error(f"❌ Checkpointing agent state failed: {str(e)}")
+    
+    def restore_state(self):
+        """Resume metrics, tuned strategies and targeting, and platform rates from the last checkpoint"""
+        started = time.perf_counter()
+        try:
+            state = self.state_store.load()
+        except Exception as e:
+            logger.error(f"❌ Restoring agent state failed, starting fresh: {str(e)}")
+            return
+        if not state:
+            return
+        
+        self.performance_metrics.update(state.get('performance_metrics', {}))
+        self.rate_limiter.restore(state.get('rate_limits', {}))
+        # Tuning only carries over if the config file has not been edited since
+        if state.get('config_digest') == self.config_digest:
+            self.config.update(state.get('config', {}))
+            self.payload_templates.invalidate(self.config)
+        else:
+            logger.info("📝 Config file changed since the last checkpoint; using its strategies and targeting")
+        
+        elapsed = (time.perf_counter() - started) * 1000
+        logger.info(f"♻️ Restored agent state #{self.state_store.sequence} in {elapsed:.1f} ms "
+                    f"({self.performance_metrics['students_acquired']} students so far)")
+    
+    def _run_acquisition_steps(self) -> int:
+        # 1. Analyze current performance
+        self.update_performance_metrics()
+        
+        # 2. Execute marketing campaigns
+        campaigns_executed = self.execute_marketing_campaigns()
+        self.persist_results()
+        
+        # 3. Monitor and optimize in real-time
+        self.monitor_campaigns()
+        
+        # 4. Update progress
+        self.update_progress()
+        
+        return campaigns_executed
+    
     def execute_marketing_campaigns(self) -> int:
         """Execute various marketing campaigns"""
+        self.plan_budget()
+        if self.config.get('sharding', {}).get('workers', 0) > 0:
+            return self.execute_sharded_campaigns()
+        
         campaigns_executed = 0
+        groups = []
+        calls = []
         
         for platform in self.config['platforms']:
-            for strategy in self.config['campaign_strategies']:
-                try:
-                    success = self.execute_campaign(platform, strategy)
-                    if success:
-                        campaigns_executed += 1
-                        logger.info(f"✅ Campaign executed: {strategy} on {platform}")
-                    else:
-                        logger.warning(f"⚠️ Campaign failed: {strategy} on {platform}")
-                        
-                except Exception as e:
-                    logger.error(f"❌ Campaign error ({platform}/{strategy}): {str(e)}")
+            strategies = self.admit_campaigns(platform, self.config['campaign_strategies'])
+            if not strategies:
+                continue
+            if self.batch_submit and self.adapters[platform].supports_batch:
+                # One submission for all of this platform's campaigns
+                groups.append((platform, strategies))
+                calls.append((platform, partial(self.execute_campaign_batch, platform, strategies)))
+            else:
+                for strategy in strategies:
+                    groups.append((platform, [strategy]))
+                    calls.append((platform, partial(self.execute_campaign, platform, strategy)))
+        
+        # Fan out all submissions at once; cycle latency is set by the slowest call
+        outcomes = self.dispatcher.dispatch(calls)
+        
+        for (platform, strategies), outcome in zip(groups, outcomes):
+            results = outcome['value']
+            if not isinstance(results, list):
+                results = [results] * len(strategies)
+            
+            for strategy, success in zip(strategies, results):
+                if self.log_campaign_outcome(platform, strategy, outcome, success):
+                    campaigns_executed += 1
         
         return campaigns_executed
     
-    def execute_campaign(self, platform: str, strategy: str) -> bool:
-        """Execute a specific marketing campaign"""
-        campaign_data = {
-            'platform': platform,
-            'strategy': strategy,
-            'budget': self.calculate_campaign_budget(platform, strategy),
-            'targeting': self.config['targeting'],
-            'creative_approach': self.generate_creative_approach(platform, strategy),
-            'tracking_id': f"{platform}_{strategy}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        }
+    def execute_sharded_campaigns(self) -> int:
+        """Execute one campaign per platform, location and strategy across worker processes"""
+        if self.shard_coordinator is None:
+            self.shard_coordinator = ShardCoordinator(
+                self.config['sharding']['workers'],
+                self.config['platforms'],
+                self.config.get('platform_api', {}),
+                self.config.get('dispatch', {})
+            )
         
-        try:
-            # Simulate API call to marketing platform
-            # In production, this would integrate with platform APIs
-            response = self.simulate_platform_api_call(platform, campaign_data)
+        campaigns = []
+        for platform in self.config['platforms']:
+            admitted = self.admit_campaigns(platform, [
+                (strategy, location)
+                for location in self.config['targeting']['locations']
+                for strategy in self.config['campaign_strategies']
+            ], key=lambda campaign: campaign[0])
+            campaigns.extend(self.build_campaign_data(platform, strategy, location)
+                             for strategy, location in admitted)
+        
+        # Workers cannot wait on the agent's buckets, so the requests they will send are paid
+        # for up front: each slice batches its own share of a platform's campaigns
+        for indexes in partition(campaigns, self.shard_coordinator.workers):
+            per_platform = collections.Counter(campaigns[index]['platform'] for index in indexes)
+            for platform, count in per_platform.items():
+                self.rate_limiter.consume(platform, math.ceil(count / self.campaigns_per_request(platform)))
+        outcomes = self.shard_coordinator.execute(campaigns)
+        
+        # Workers only submit; results are merged here so metrics stay in one place
+        campaigns_executed = 0
+        for campaign_data, outcome in zip(campaigns, outcomes):
+            self.metrics.platform_call_seconds.observe(
+                outcome['elapsed'], platform=campaign_data['platform'], kind='sharded')
+            success = False
+            if outcome['value'] is not None:
+                success = self.handle_campaign_response(campaign_data, outcome['value'])
+            label = f"{campaign_data['strategy']} @ {campaign_data['location']}"
+            if self.log_campaign_outcome(campaign_data['platform'], label, outcome, success):
+                campaigns_executed += 1
+        
+        return campaigns_executed
+    
+    def build_platform_adapters(self, platforms: List[str], platform_api: Dict) -> Dict:
+        """Build platform adapters, opening the shared HTTP session only for real APIs"""
+        if platform_api.get('mode', 'simulated') == 'http' and self.http_session is None:
+            self.http_session = create_session(platform_api.get('pool_size', 32))
+        return build_adapters(platforms, platform_api, self.http_session, rng=self.rng, sleep=self.clock.sleep)
+    
+    def campaigns_per_request(self, platform: str) -> int:
+        """How many campaigns one submission to a platform carries"""
+        adapter = self.adapters[platform]
+        return adapter.max_batch_size if self.batch_submit and adapter.supports_batch else 1
+    
+    def admit_campaigns(self, platform: str, campaigns: List, key=None) -> List:
+        """Keep the campaigns a platform's rate limit lets start this cycle.
+        
+        The highest-budget strategies go first; the rest are deferred to a
+        later cycle rather than queued behind the limit.
+        """
+        per_request = self.campaigns_per_request(platform)
+        wanted = len(campaigns)
+        admitted = self.rate_limiter.admit(platform, math.ceil(wanted / per_request)) * per_request
+        if admitted >= wanted:
+            return list(campaigns)
+        
+        key = key or (lambda strategy: strategy)
+        ranked = sorted(campaigns, key=lambda campaign: self.calculate_campaign_budget(platform, key(campaign)),
+                        reverse=True)
+        self.metrics.campaigns_total.inc(wanted - admitted, platform=platform, result='throttled')
+        logger.warning(f"🚦 Deferred {wanted - admitted} of {wanted} campaigns on {platform} to respect its rate limit")
+        return ranked[:admitted]
+    
+    def log_campaign_outcome(self, platform: str, strategy: str, outcome: Dict, success: bool) -> bool:
+        """Log a dispatched campaign's outcome; returns whether it was executed"""
+        if outcome['timed_out'] and outcome['pending']:
+            # Already sent: the late response is counted and stored when it arrives
+            logger.warning(f"⏱️ Campaign response late: {strategy} on {platform} ({outcome['error']})")
+        elif outcome['timed_out']:
+            self.metrics.campaigns_total.inc(platform=platform, result='timeout')
+            logger.warning(f"⏱️ Campaign timed out: {strategy} on {platform} ({outcome['error']})")
+        elif outcome['error']:
+            self.metrics.campaigns_total.inc(platform=platform, result='error')
+            logger.error(f"❌ Campaign error ({platform}/{strategy}): {outcome['error']}")
+        elif success:
+            logger.info(f"✅ Campaign executed: {strategy} on {platform}")
+            return True
+        else:
+            logger.warning(f"⚠️ Campaign failed: {strategy} on {platform}")
+        return False
+    
+    def build_campaign_data(self, platform: str, strategy: str, location: Optional[str] = None) -> Dict:
+        """Build the submission payload for a campaign.
+        
+        With a ``location`` the campaign targets only that location and gets
+        an even share of the platform/strategy budget. Only the budget,
+        tracking id and creative variant are filled in per campaign; the rest
+        comes from a compiled template.
+        """
+        return self.payload_templates.build(
+            platform, strategy, location,
+            self.calculate_campaign_budget(platform, strategy),
+            self.clock.now()
+        )
+    
+    def execute_campaign(self, platform: str, strategy: str, token: Optional[CallToken] = None) -> bool:
+        """Execute a specific marketing campaign"""
+        with self.metrics.timer(self.metrics.campaign_seconds, platform=platform):
+            campaign_data = self.build_campaign_data(platform, strategy)
+            if not self.rate_limiter.acquire(platform):
+                self.metrics.campaigns_total.inc(platform=platform, result='throttled')
+                return False
+            # Past the dispatch deadline nothing is sent; the dispatcher reports the timeout
+            if token is not None and not token.start():
+                return False
             
-            if response.get('success'):
-                # Log campaign execution
-                self.log_campaign_execution(campaign_data, response)
-                return True
-            else:
+            try:
+                with self.metrics.timer(self.metrics.platform_call_seconds, platform=platform, kind='single'):
+                    response = self.adapters[platform].submit_campaign(campaign_data)
+                return self.handle_campaign_response(campaign_data, response)
+                    
+            except Exception as e:
+                self.metrics.campaigns_total.inc(platform=platform, result='error')
+                logger.error(f"Campaign execution error: {str(e)}")
                 return False
+    
+    def execute_campaign_batch(self, platform: str, strategies: List[str],
+                               token: Optional[CallToken] = None) -> List[bool]:
+        """Execute several campaigns on one platform in a batched submission"""
+        batch = [self.build_campaign_data(platform, strategy) for strategy in strategies]
+        if not self.rate_limiter.acquire(platform, math.ceil(len(batch) / self.adapters[platform].max_batch_size)):
+            self.metrics.campaigns_total.inc(len(batch), platform=platform, result='throttled')
+            return [False] * len(batch)
+        if token is not None and not token.start():
+            return [False] * len(batch)
+        
+        try:
+            with self.metrics.timer(self.metrics.platform_call_seconds, platform=platform, kind='batch'):
+                responses = self.adapters[platform].submit_batch(batch)
+            return [
+                self.handle_campaign_response(campaign_data, response)
+                for campaign_data, response in zip(batch, responses)
+            ]
                 
         except Exception as e:
-            logger.error(f"Campaign execution error: {str(e)}")
-            return False
-    
-    def simulate_platform_api_call(self, platform: str, campaign_data: Dict) -> Dict:
-        """Simulate API call to marketing platform"""
-        # Simulate API delay
-        time.sleep(random.uniform(0.5, 2.0))
-        
-        # Simulate different success rates per platform
-        platform_success_rates = {
-            'facebook': 0.85,
-            'instagram': 0.80,
-            'tiktok': 0.75,
-            'google_ads': 0.90
-        }
-        
-        success_rate = platform_success_rates.get(platform, 0.70)
-        success = random.random() < success_rate
+            self.metrics.campaigns_total.inc(len(strategies), platform=platform, result='error')
+            logger.error(f"Batch execution error ({platform}): {str(e)}")
+            return [False] * len(strategies)
+    
+    def handle_campaign_response(self, campaign_data: Dict, response: Dict) -> bool:
+        """Record a platform response; returns whether the campaign was accepted"""
+        platform = campaign_data['platform']
+        self.rate_limiter.record(platform, response)
+        if response.get('success'):
+            self.metrics.campaigns_total.inc(platform=platform, result='accepted')
+            # Store the results for analysis and log the execution
+            timestamp = self.clock.time()
+            arm = (campaign_data['platform'], campaign_data['strategy'])
+            self.results_store.append_result(campaign_data, response, timestamp)
+            self.aggregates.record(*arm, response, timestamp)
+            self.campaign_registry.add(campaign_data, response, timestamp)
+            self.allocator.update(arm, response.get('conversions', 0), response.get('cost', 0.0))
+            self.log_campaign_execution(campaign_data, response)
+            return True
         
-        if success:
-            # Simulate campaign results
-            impressions = random.randint(5000, 50000)
-            clicks = random.randint(50, 500)
-            conversions = random.randint(1, 20)
-            
-            return {
-                'success': True,
-                'campaign_id': f"camp_{random.randint(10000, 99999)}",
-                'impressions': impressions,
-                'clicks': clicks,
-                'conversions': conversions,
-                'cost': campaign_data['budget'] * 0.8,  # 80% of budget spent
-                'cpa': campaign_data['budget'] / conversions if conversions > 0 else 0
-            }
-        else:
-            return {
-                'success': False,
-                'error': 'Campaign rejected by platform',
-                'error_code': 'POLICY_VIOLATION' if random.random() < 0.3 else 'BUDGET_TOO_LOW'
-            }
+        self.metrics.campaigns_total.inc(platform=platform, result='rejected')
+        self.metrics.rejections_total.inc(platform=platform, error_code=response.get('error_code', 'UNKNOWN'))
+        return False
+    
+    def persist_results(self):
+        """Flush stored campaign results and snapshot the rolling aggregates and registry"""
+        try:
+            self.results_store.flush()
+            self.aggregates.save(self.aggregates_path)
+            self.campaign_registry.save(self.registry_path)
+        except Exception as e:
+            logger.error(f"❌ Persisting campaign results failed: {str(e)}")
+    
+    def build_budget_allocator(self, config: Dict):
+        """Build the budget allocator, warm-started from the results seen so far"""
+        allocator = build_allocator(config.get('budget_allocator', {}), rng=self.rng)
+        for row in self.aggregates.totals(by=KEYS):
+            allocator.update((row['platform'], row['strategy']), row['conversions'], row['cost'])
+        return allocator
+    
+    def plan_budget(self):
+        """Split the daily budget across platform/strategy arms for this cycle"""
+        arms = [
+            (platform, strategy)
+            for platform in self.config['platforms']
+            for strategy in self.config['campaign_strategies']
+        ]
+        self.budget_allocation = self.allocator.allocate(arms, self.config['daily_budget'])
     
     def calculate_campaign_budget(self, platform: str, strategy: str) -> float:
         """Calculate optimal budget for a campaign"""
-        base_budget = self.config['daily_budget'] / len(self.config['platforms'])
-        
-        # Adjust based on platform performance
-        platform_multipliers = {
-            'facebook': 1.2,
-            'instagram': 1.1,
-            'tiktok': 0.9,
-            'google_ads': 1.3
-        }
-        
-        # Adjust based on strategy
-        strategy_multipliers = {
-            'free_trial_offer': 1.5,
-            'discount_campaign': 1.2,
-            'webinar_signup': 0.8,
-            'content_marketing': 0.7,
-            'influencer_partnerships': 2.0
-        }
-        
-        multiplier = platform_multipliers.get(platform, 1.0) * strategy_multipliers.get(strategy, 1.0)
-        return base_budget * multiplier
+        if (platform, strategy) not in self.budget_allocation:
+            self.plan_budget()
+        return self.budget_allocation.get((platform, strategy), 0.0)
     
     def generate_creative_approach(self, platform: str, strategy: str) -> Dict:
         """Generate AI-optimized creative approach for campaign"""
-        approaches = {
-            'facebook': {
-                'ad_type': 'carousel',
-                'headline': f"Master AI Skills - {random.choice(['Limited', 'Special', 'Exclusive'])} Offer",
-                'description': "Join thousands learning cutting-edge AI technologies. Transform your career today!",
-                'cta': 'LEARN_MORE'
-            },
-            'instagram': {
-                'ad_type': 'story',
-                'headline': 'AI Course That Actually Works!',
-                'description': 'See real results in weeks, not years. 👇',
-                'cta': 'SWIPE_UP'
-            },
-            'tiktok': {
-                'ad_type': 'in_feed',
-                'headline': 'This AI skill changed everything!',
-                'description': 'Find out why professionals are switching to AI careers',
-                'cta': 'LEARN_MORE'
-            },
-            'google_ads': {
-                'ad_type': 'search',
-                'headline': 'AI Courses - Expert-Led Training',
-                'description': 'Learn from industry experts. Get certified. Advance your career.',
-                'cta': 'ENROLL_NOW'
-            }
-        }
-        
-        return approaches.get(platform, approaches['facebook'])
+        return self.payload_templates.creative(platform)
     
     def monitor_campaigns(self):
         """Monitor active campaigns and optimize performance"""
         logger.info("👀 Monitoring active campaigns")
         
-        # Simulate campaign monitoring
-        active_campaigns = random.randint(3, 8)
-        for i in range(active_campaigns):
-            try:
-                performance = self.get_campaign_performance(i)
-                if performance['cpa'] > self.performance_metrics['cost_per_acquisition'] * 1.5:
+        retired = self.campaign_registry.expire(self.clock.time())
+        if retired:
+            logger.info(f"🏁 Retired {retired} finished campaigns")
+        
+        # Only campaigns past a threshold are visited
+        monitoring = self.config.get('campaign_registry', {})
+        pause_above = self.performance_metrics['cost_per_acquisition'] * monitoring.get('pause_cpa_multiplier', 1.5)
+        if pause_above > 0:
+            for record in self.campaign_registry.above_cpa(pause_above):
+                try:
                     # Pause underperforming campaigns
-                    self.pause_campaign(i)
-                    logger.warning(f"⏸️ Paused underperforming campaign {i}")
-                elif performance['conversion_rate'] > 0.05:
-                    # Increase budget for high-performing campaigns
-                    self.increase_campaign_budget(i, 1.2)
-                    logger.info(f"💰 Increased budget for high-performing campaign {i}")
-                    
+                    self.pause_campaign(record.key)
+                    logger.warning(f"⏸️ Paused underperforming campaign {record.key}")
+                except Exception as e:
+                    logger.error(f"❌ Campaign monitoring error: {str(e)}")
+        
+        for record in self.campaign_registry.above_conversion_rate(monitoring.get('scale_conversion_rate', 0.05)):
+            try:
+                # Increase budget for high-performing campaigns
+                self.increase_campaign_budget(record.key, monitoring.get('scale_multiplier', 1.2))
+                logger.info(f"💰 Increased budget for high-performing campaign {record.key}")
             except Exception as e:
                 logger.error(f"❌ Campaign monitoring error: {str(e)}")
+        
+        counts = self.campaign_registry.counts('status')
+        self.performance_metrics['campaigns_active'] = counts.get('active', 0) + counts.get('scaled', 0)
     
     def analyze_performance(self):
         """Analyze overall performance and make strategic adjustments"""
@@ -296,42 +804,63 @@ class StudentAcquisitionAgent:
         # Log performance analysis
         self.log_performance_analysis()
     
+    def update_performance_metrics(self):
+        """Refresh performance metrics before a cycle"""
+        self.calculate_metrics()
+    
     def calculate_metrics(self):
         """Calculate key performance metrics"""
-        # Simulate metric calculation
-        self.performance_metrics['students_acquired'] += random.randint(5, 25)
-        self.performance_metrics['conversion_rate'] = random.uniform(0.02, 0.08)
-        self.performance_metrics['cost_per_acquisition'] = random.uniform(150, 400)
-        self.performance_metrics['total_revenue'] = self.performance_metrics['students_acquired'] * 500  # Average course price
+        totals = self.aggregates.totals()[0]
+        self.performance_metrics['students_acquired'] = totals['conversions']
+        self.performance_metrics['conversion_rate'] = totals['conversion_rate']
+        self.performance_metrics['cost_per_acquisition'] = totals['cpa']
+        self.performance_metrics['total_revenue'] = totals['revenue']
+        
+        # Per platform/strategy breakdown for the analysis log
+        self.metrics_breakdown = self.aggregates.totals(by=('platform', 'strategy'))
     
     def identify_top_strategies(self) -> List[str]:
         """Identify top performing acquisition strategies"""
-        # Simulate strategy performance analysis
         strategies = self.config['campaign_strategies']
-        return random.sample(strategies, min(3, len(strategies)))
+        ranked = self.aggregates.rank('strategy', candidates=strategies)
+        if not ranked:
+            # Nothing to rank yet; keep every strategy in play
+            return list(strategies)
+        return ranked[:min(3, len(strategies))]
+    
+    def optimize_strategies(self):
+        """Refocus strategies and targeting on current performance"""
+        self.optimize_configuration(self.identify_top_strategies())
     
     def optimize_configuration(self, best_strategies: List[str]):
         """Optimize agent configuration based on performance"""
-        # Focus on best performing strategies
-        self.config['campaign_strategies'] = best_strategies
+        # An adaptive allocator already shifts budget toward the best strategies
+        # and needs the others kept in play to keep exploring them
+        if not self.allocator.adaptive:
+            self.config['campaign_strategies'] = best_strategies
         
         # Adjust targeting based on performance
         self.optimize_targeting()
         
+        # Compiled payloads embed the old targeting
+        self.payload_templates.invalidate()
+        
         logger.info(f"🎯 Optimized configuration. Focus strategies: {best_strategies}")
     
     def optimize_targeting(self):
         """Optimize targeting parameters based on performance"""
         # Simulate targeting optimization
         current_age_range = self.config['targeting']['age_range']
-        if random.random() < 0.3:  # 30% chance to adjust targeting
-            new_min = max(18, current_age_range[0] + random.randint(-2, 2))
-            new_max = min(65, current_age_range[1] + random.randint(-2, 2))
+        if self.rng.random() < 0.3:  # 30% chance to adjust targeting
+            new_min = max(18, current_age_range[0] + self.rng.randint(-2, 2))
+            new_max = min(65, current_age_range[1] + self.rng.randint(-2, 2))
             self.config['targeting']['age_range'] = [new_min, new_max]
             logger.info(f"🎯 Adjusted age range to {new_min}-{new_max}")
     
     def update_progress(self):
         """Update agent progress in the central system"""
+        # Include the campaigns this cycle just ran
+        self.calculate_metrics()
         progress_percentage = (self.performance_metrics['students_acquired'] / self.target_students) * 100
         
         update_data = {
@@ -340,54 +869,87 @@ class StudentAcquisitionAgent:
             'progress_percentage': progress_percentage,
             'success_rate': self.performance_metrics['conversion_rate'] * 100,
             'efficiency_score': max(0, 100 - (self.performance_metrics['cost_per_acquisition'] / 10)),
-            'last_run': datetime.now().isoformat()
+            'last_run': self.clock.now().isoformat()
         }
         
-        try:
-            # Send update to main system
-            response = requests.post(
-                f"{self.base_url}/ai-agents/update",
-                json=update_data,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                logger.info(f"📈 Progress updated: {progress_percentage:.1f}% complete")
-            else:
-                logger.warning(f"⚠️ Failed to update progress: {response.status_code}")
-                
-        except requests.RequestException as e:
-            logger.error(f"❌ Progress update failed: {str(e)}")
+        # Send update to main system; delivery and retries happen in the background
+        self.progress_publisher.publish(update_data)
+        logger.info(f"📈 Progress queued: {progress_percentage:.1f}% complete")
+    
+    def record_progress_attempt(self, status: str, elapsed: float):
+        """Count one progress delivery attempt made by the publisher"""
+        self.metrics.progress_total.inc(status=status)
+        self.metrics.progress_seconds.observe(elapsed)
+    
+    def record_log_flush(self, path: str, elapsed: float):
+        """Time one batch written by the JSONL writer thread"""
+        stream = os.path.splitext(os.path.basename(path))[0]
+        self.metrics.log_flush_seconds.observe(elapsed, stream=stream)
     
     def generate_daily_report(self):
         """Generate daily performance report"""
+        self.calculate_metrics()
+        now = self.clock.time()
         report = {
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'date': self.clock.now().strftime('%Y-%m-%d'),
             'agent_id': self.agent_id,
             'students_acquired': self.performance_metrics['students_acquired'],
             'conversion_rate': self.performance_metrics['conversion_rate'],
             'cost_per_acquisition': self.performance_metrics['cost_per_acquisition'],
             'total_revenue': self.performance_metrics['total_revenue'],
             'progress_percentage': (self.performance_metrics['students_acquired'] / self.target_students) * 100,
+            'windows': {name: self.aggregates.window(name, now=now)[0] for name in WINDOWS},
+            'last_24h_by_platform': self.aggregates.window('24h', by=('platform',), now=now),
+            'scheduler': self.scheduler.metrics() if self.scheduler else {},
             'recommendations': self.generate_recommendations()
         }
         
         try:
-            with open(f'reports/student_acquisition_{datetime.now().strftime("%Y%m%d")}.json', 'w') as f:
+            os.makedirs(self.reports_dir, exist_ok=True)
+            report_path = os.path.join(self.reports_dir, f'student_acquisition_{self.clock.now().strftime("%Y%m%d")}.json')
+            with open(report_path, 'w') as f:
                 json.dump(report, f, indent=2)
             
             logger.info("📋 Daily report generated")
         except Exception as e:
             logger.error(f"❌ Report generation failed: {str(e)}")
     
+    def generate_trend_report(self):
+        """Write campaign metrics per period over the last ``trend_days`` days"""
+        report_config = self.config.get('reports', {})
+        now = self.clock.time()
+        rows = campaign_report(
+            self.metrics_engine,
+            since=now - report_config.get('trend_days', 28) * 86400,
+            until=now,
+            group_by=report_config.get('trend_group_by', ['platform']),
+            interval=report_config.get('trend_period', 'day')
+        )
+        fmt = report_config.get('trend_format', 'csv')
+        path = os.path.join(self.reports_dir, f'student_acquisition_trend_{self.clock.now().strftime("%Y%m%d")}.{fmt}')
+        
+        try:
+            count = save_report(rows, path, fmt)
+            logger.info(f"📈 Trend report written: {path} ({count} rows)")
+        except Exception as e:
+            logger.error(f"❌ Trend report failed: {str(e)}")
+    
     def generate_recommendations(self) -> List[str]:
         """Generate AI-powered recommendations for improvement"""
         recommendations = []
         
-        if self.performance_metrics['conversion_rate'] < 0.03:
+        # Judge on the last 24 hours when there is activity, otherwise on all-time metrics
+        recent = self.aggregates.window('24h', now=self.clock.time())[0]
+        if recent['campaigns']:
+            conversion_rate, cost_per_acquisition = recent['conversion_rate'], recent['cpa']
+        else:
+            conversion_rate = self.performance_metrics['conversion_rate']
+            cost_per_acquisition = self.performance_metrics['cost_per_acquisition']
+        
+        if conversion_rate < 0.03:
             recommendations.append("Increase landing page optimization and improve call-to-action")
         
-        if self.performance_metrics['cost_per_acquisition'] > 300:
+        if cost_per_acquisition > 300:
             recommendations.append("Optimize ad targeting and focus on higher-converting audiences")
         
         if len(self.config['campaign_strategies']) < 3:
@@ -401,18 +963,18 @@ class StudentAcquisitionAgent:
     def log_campaign_execution(self, campaign_data: Dict, response: Dict):
         """Log campaign execution details"""
         log_entry = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': self.clock.now().isoformat(),
             'agent_id': self.agent_id,
+            # Payload targeting is a template snapshot that is never mutated
             'campaign_data': campaign_data,
             'response': response,
             'performance_impact': self.calculate_performance_impact(response)
         }
         
-        try:
-            with open('logs/campaign_executions.jsonl', 'a') as f:
-                f.write(json.dumps(log_entry) + '\n')
-        except Exception as e:
-            logger.error(f"❌ Campaign logging failed: {str(e)}")
+        with self.metrics.timer(self.metrics.log_enqueue_seconds, stream='campaign_executions'):
+            queued = self.log_writer.write(os.path.join(self.log_dir, 'campaign_executions.jsonl'), log_entry)
+        if not queued:
+            logger.error("❌ Campaign logging failed: log queue full")
     
     def calculate_performance_impact(self, response: Dict) -> Dict:
         """Calculate performance impact of a campaign"""
@@ -431,43 +993,39 @@ class StudentAcquisitionAgent:
         else:
             return {'impact': 'neutral', 'reason': 'average_performance'}
     
-    def pause_campaign(self, campaign_id: int):
+    def pause_campaign(self, campaign_id: str):
         """Pause a specific campaign"""
         # Simulate campaign pausing
+        self.campaign_registry.set_status(campaign_id, 'paused')
         logger.info(f"⏸️ Pausing campaign {campaign_id}")
     
-    def increase_campaign_budget(self, campaign_id: int, multiplier: float):
+    def increase_campaign_budget(self, campaign_id: str, multiplier: float):
         """Increase budget for a campaign"""
         # Simulate budget increase
+        self.campaign_registry.scale_budget(campaign_id, multiplier)
         logger.info(f"💰 Increasing budget for campaign {campaign_id} by {multiplier}x")
     
-    def get_campaign_performance(self, campaign_id: int) -> Dict:
+    def get_campaign_performance(self, campaign_id: str) -> Dict:
         """Get performance data for a specific campaign"""
-        # Simulate performance data
-        return {
-            'campaign_id': campaign_id,
-            'impressions': random.randint(1000, 50000),
-            'clicks': random.randint(50, 500),
-            'conversions': random.randint(1, 15),
-            'cpa': random.uniform(100, 600),
-            'conversion_rate': random.uniform(0.01, 0.10)
-        }
+        record = self.campaign_registry.get(campaign_id)
+        return record.as_dict() if record is not None else {}
     
     def log_performance_analysis(self):
         """Log performance analysis results"""
         analysis = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': self.clock.now().isoformat(),
             'agent_id': self.agent_id,
-            'metrics': self.performance_metrics,
-            'config_updates': self.config,
+            'metrics': dict(self.performance_metrics),
+            'breakdown': self.metrics_breakdown,
+            'rate_limits': self.rate_limiter.snapshot(),
+            'config_updates': copy.deepcopy(self.config),
             'insights': self.generate_ai_insights()
         }
         
-        try:
-            with open('logs/performance_analysis.jsonl', 'a') as f:
-                f.write(json.dumps(analysis) + '\n')
-        except Exception as e:
-            logger.error(f"❌ Performance analysis logging failed: {str(e)}")
+        with self.metrics.timer(self.metrics.log_enqueue_seconds, sample=False, stream='performance_analysis'):
+            queued = self.log_writer.write(os.path.join(self.log_dir, 'performance_analysis.jsonl'), analysis)
+        if not queued:
+            logger.error("❌ Performance analysis logging failed: log queue full")
     
     def generate_ai_insights(self) -> List[str]:
         """Generate AI-powered insights from performance data"""
@@ -484,10 +1042,12 @@ class StudentAcquisitionAgent:
         
         return insights if insights else ["Performance stable. Continue monitoring."]
 
-def main():
+def main(log_level: str = 'INFO'):
     """Main function to start the agent"""
+    config = StudentAcquisitionAgent.load_config()
+    configure_logging(config.get('log_writer', {}).get('log_dir', 'logs'), log_level)
     try:
-        agent = StudentAcquisitionAgent()
+        agent = StudentAcquisitionAgent(config=config)
         agent.start()
     except Exception as e:
         logger.error(f"❌ Agent failed to start: {str(e)}")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The agent modules are flat siblings of this directory, imported as ``from x import Y``
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,130 @@
+import os
+
+import pytest
+
+from agent_state import SNAPSHOT_HEADER, StateStore
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / 'state.bin')
+    store = StateStore(path)
+    store.save({'metrics': {'students': 3}, 'rates': [1, 2]})
+    store.save({'metrics': {'students': 5}, 'rates': [1, 2]})
+    store.close(compact=False)
+
+    restored = StateStore(path)
+    assert restored.load() == {'metrics': {'students': 5}, 'rates': [1, 2]}
+    assert restored.sequence == 2
+    assert restored.wal_records == 2
+
+
+def test_unchanged_state_writes_nothing(tmp_path):
+    store = StateStore(str(tmp_path / 'state.bin'))
+    assert store.save({'a': (1, 2)})
+    assert not store.save({'a': [1, 2]})
+    assert store.sequence == 1
+
+
+def test_torn_record_is_dropped_and_truncated(tmp_path):
+    path = str(tmp_path / 'state.bin')
+    store = StateStore(path)
+    store.save({'a': 1})
+    store.save({'a': 2})
+    store.close(compact=False)
+    intact = os.path.getsize(path + '.wal')
+
+    # A crash mid-append leaves half a record at the end of the WAL
+    with open(path + '.wal', 'rb') as f:
+        data = f.read()
+    with open(path + '.wal', 'ab') as f:
+        f.write(data[:len(data) // 2 - 3])
+
+    restored = StateStore(path)
+    assert restored.load() == {'a': 2}
+    assert os.path.getsize(path + '.wal') == intact
+
+    # New records land after the truncated tail and replay normally
+    restored.save({'a': 3})
+    restored.close(compact=False)
+    assert StateStore(path).load() == {'a': 3}
+
+
+def test_corrupt_record_stops_replay(tmp_path):
+    path = str(tmp_path / 'state.bin')
+    store = StateStore(path)
+    store.save({'a': 1})
+    store.save({'a': 2})
+    store.close(compact=False)
+
+    with open(path + '.wal', 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+
+    assert StateStore(path).load() == {'a': 1}
+
+
+def test_snapshot_folds_wal_every_n_records(tmp_path):
+    path = str(tmp_path / 'state.bin')
+    store = StateStore(path, snapshot_every=3)
+    for value in range(7):
+        store.save({'a': value})
+    store.close(compact=False)
+
+    assert os.path.exists(path)
+    restored = StateStore(path)
+    assert restored.load() == {'a': 6}
+    assert restored.sequence == 7
+    assert restored.wal_records == 1
+
+
+def test_crash_between_snapshot_and_wal_truncate(tmp_path):
+    path = str(tmp_path / 'state.bin')
+    store = StateStore(path)
+    store.save({'a': 1, 'b': 1})
+    store.save({'a': 2})
+    with open(path + '.wal', 'rb') as f:
+        wal = f.read()
+    store.snapshot()
+    store.close(compact=False)
+
+    # The snapshot was renamed into place but the WAL still holds its records
+    with open(path + '.wal', 'wb') as f:
+        f.write(wal)
+
+    restored = StateStore(path)
+    assert restored.load() == {'a': 2, 'b': 1}
+    assert restored.sequence == 2
+    assert restored.wal_records == 0
+
+    restored.save({'b': 5})
+    restored.close(compact=False)
+    reopened = StateStore(path)
+    assert reopened.load() == {'a': 2, 'b': 5}
+    assert reopened.sequence == 3
+
+
+def test_corrupt_snapshot_raises(tmp_path):
+    path = str(tmp_path / 'state.bin')
+    store = StateStore(path)
+    store.save({'a': 1})
+    store.close()
+
+    with open(path, 'r+b') as f:
+        f.seek(SNAPSHOT_HEADER.size)
+        first = f.read(1)
+        f.seek(SNAPSHOT_HEADER.size)
+        f.write(bytes([first[0] ^ 0xFF]))
+
+    with pytest.raises(ValueError, match='checksum'):
+        StateStore(path).load()
+
+
+def test_truncated_snapshot_raises(tmp_path):
+    path = str(tmp_path / 'state.bin')
+    with open(path, 'wb') as f:
+        f.write(b'AGST')
+
+    with pytest.raises(ValueError, match='truncated'):
+        StateStore(path).load()
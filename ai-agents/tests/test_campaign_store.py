@@ -0,0 +1,154 @@
+import json
+import os
+
+import pytest
+
+import campaign_store
+from campaign_store import MANIFEST, CampaignResultStore
+
+
+def append_rows(store, count, conversions=5, start=0):
+    for index in range(start, start + count):
+        store.append(1.7e9 + index, 'facebook', 'free_trial_offer', 100, 10, conversions, 50.0, 10.0)
+
+
+def test_flush_and_reopen(tmp_path):
+    root = str(tmp_path / 'results')
+    store = CampaignResultStore(root, segment_rows=8)
+    append_rows(store, 20)
+    store.close()
+
+    reopened = CampaignResultStore(root, segment_rows=8)
+    assert len(reopened) == 20
+    assert reopened.read(['conversions'])['conversions'].sum() == 100
+    assert reopened.categories('platform') == ['facebook']
+    reopened.close()
+
+
+def test_rows_after_last_flush_are_not_committed(tmp_path):
+    root = str(tmp_path / 'results')
+    store = CampaignResultStore(root, segment_rows=8)
+    append_rows(store, 5)
+    store.flush()
+    append_rows(store, 2, start=5)
+
+    # Only the manifest commits rows; the two buffered ones never reached it
+    reader = CampaignResultStore(root, read_only=True)
+    assert len(reader) == 5
+    reader.close()
+    store.close()
+
+
+def test_writer_removes_segments_missing_from_manifest(tmp_path):
+    root = str(tmp_path / 'results')
+    store = CampaignResultStore(root, segment_rows=8)
+    append_rows(store, 10)
+    store.close()
+
+    # An interrupted flush leaves a segment the manifest never listed
+    stray = os.path.join(root, 'seg_000099_99')
+    os.makedirs(stray)
+    reader = CampaignResultStore(root, read_only=True)
+    assert os.path.exists(stray)
+    reader.close()
+
+    writer = CampaignResultStore(root, segment_rows=8)
+    assert not os.path.exists(stray)
+    assert len(writer) == 10
+    writer.close()
+
+
+@pytest.mark.skipif(campaign_store.fcntl is None, reason="needs advisory file locks")
+def test_second_writer_is_refused(tmp_path):
+    root = str(tmp_path / 'results')
+    store = CampaignResultStore(root)
+    with pytest.raises(RuntimeError, match='already open for writing'):
+        CampaignResultStore(root)
+    store.close()
+
+    # The lock goes with the writer
+    CampaignResultStore(root).close()
+
+
+def test_read_only_open_does_not_write(tmp_path):
+    root = str(tmp_path / 'results')
+    store = CampaignResultStore(root, segment_rows=8)
+    append_rows(store, 3)
+    store.flush()
+
+    reader = CampaignResultStore(root, read_only=True)
+    with pytest.raises(RuntimeError, match='read-only'):
+        append_rows(reader, 1)
+    with open(os.path.join(root, MANIFEST)) as f:
+        manifest = f.read()
+    reader.close()
+    with open(os.path.join(root, MANIFEST)) as f:
+        assert f.read() == manifest
+    store.close()
+
+
+def test_read_only_open_of_missing_store(tmp_path):
+    root = str(tmp_path / 'missing')
+    reader = CampaignResultStore(root, read_only=True)
+    assert len(reader) == 0
+    assert not os.path.exists(root)
+
+
+class RacingReader(CampaignResultStore):
+    """Reader whose first segment load lets the writer flush a new tail first"""
+
+    writer = None
+
+    def _load_segment(self, name, rows):
+        writer, RacingReader.writer = RacingReader.writer, None
+        if writer is not None:
+            append_rows(writer, 1, start=100)
+            writer.flush()
+        return super()._load_segment(name, rows)
+
+
+def test_read_only_open_during_writer_flush(tmp_path):
+    root = str(tmp_path / 'results')
+    store = CampaignResultStore(root, segment_rows=8)
+    append_rows(store, 3)
+    store.flush()
+    with open(os.path.join(root, MANIFEST)) as f:
+        tail = json.load(f)['tail']['name']
+
+    RacingReader.writer = store
+    reader = RacingReader(root, read_only=True)
+
+    # The tail the reader first saw was replaced; it retried on the new manifest
+    assert not os.path.exists(os.path.join(root, tail))
+    assert len(reader) == 4
+    reader.close()
+    store.close()
+
+
+def test_missing_location_column_reads_as_all(tmp_path):
+    root = str(tmp_path / 'results')
+    store = CampaignResultStore(root, segment_rows=4)
+    append_rows(store, 4)
+    store.close()
+
+    # Segments written before the location column existed have no file for it
+    segment = CampaignResultStore(root, read_only=True)._sealed[0]['name']
+    os.remove(os.path.join(root, segment, 'location.npy'))
+
+    reader = CampaignResultStore(root, read_only=True)
+    assert reader.read(['location'])['location'].tolist() == [0, 0, 0, 0]
+    assert reader.categories('location')[0] == campaign_store.ALL_LOCATIONS
+
+
+def test_missing_column_raises(tmp_path):
+    root = str(tmp_path / 'results')
+    store = CampaignResultStore(root, segment_rows=4)
+    append_rows(store, 4)
+    store.close()
+
+    segment = CampaignResultStore(root, read_only=True)._sealed[0]['name']
+    os.remove(os.path.join(root, segment, 'conversions.npy'))
+
+    reader = CampaignResultStore(root, read_only=True)
+    with pytest.raises(FileNotFoundError):
+        reader.read(['conversions'])